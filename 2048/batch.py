@@ -0,0 +1,164 @@
+"""
+Headless NumPy simulator that steps many 2048 boards at once.
+
+Boards are held as one (N, 4, 4) uint8 array of tile exponents, the same
+encoding used by the bitboard engine. Rows are packed into 16 bit indices
+and resolved through the engine's row tables, so a step is a handful of
+array operations regardless of N.
+"""
+import numpy as np
+
+import engine
+
+UP, DOWN, LEFT, RIGHT = engine.MOVES
+
+# -- row index -> row after sliding left/right, and the score of that slide
+_ROWS = np.arange(65536, dtype=np.uint16)
+LEFT_TABLE = _ROWS ^ np.array(engine.ROW_LEFT, dtype=np.uint16)
+RIGHT_TABLE = _ROWS ^ np.array(engine.ROW_RIGHT, dtype=np.uint16)
+SCORE_TABLE = np.array(engine.ROW_SCORE, dtype=np.int64)
+# -- bit 0 set if a row can slide left, bit 1 if it can slide right
+LEGAL_BITS = (LEFT_TABLE != _ROWS).astype(np.uint8) | (
+    (RIGHT_TABLE != _ROWS).astype(np.uint8) << 1
+)
+
+
+def pack_rows(boards):
+    """Pack (N, 4, 4) exponents into (N, 4) row indices"""
+    # -- two nibbles per byte, two bytes per little endian uint16 row
+    boards = np.ascontiguousarray(boards)
+    packed = boards[..., 0::2] | (boards[..., 1::2] << 4)
+    return np.ascontiguousarray(packed).view("<u2")[..., 0]
+
+
+def pack_cols(boards):
+    """Pack (N, 4, 4) exponents into (N, 4) column indices"""
+    return pack_rows(boards.transpose(0, 2, 1))
+
+
+def unpack_rows(rows):
+    """Unpack (N, 4) row indices into (N, 4, 4) exponents"""
+    packed = np.ascontiguousarray(rows, dtype="<u2")[..., None].view(np.uint8)
+    cells = np.empty(packed.shape[:-1] + (4,), dtype=np.uint8)
+    cells[..., 0::2] = packed & 0xF
+    cells[..., 1::2] = packed >> 4
+    return cells
+
+
+def apply_moves(boards, moves):
+    """Apply one move per board, returns new boards and scores"""
+    vertical = (moves == UP) | (moves == DOWN)
+    towards_start = (moves == UP) | (moves == LEFT)
+
+    # -- up/down slide the columns, left/right slide the rows
+    lines = np.where(vertical[:, None], pack_cols(boards), pack_rows(boards))
+    moved = np.where(towards_start[:, None], LEFT_TABLE[lines], RIGHT_TABLE[lines])
+
+    cells = unpack_rows(moved)
+    cells = np.where(vertical[:, None, None], cells.transpose(0, 2, 1), cells)
+    return cells, SCORE_TABLE[lines].sum(axis=1)
+
+
+def legal_mask(boards):
+    """(N, 4) mask of the moves that change each board"""
+    rows = np.bitwise_or.reduce(LEGAL_BITS[pack_rows(boards)], axis=1)
+    cols = np.bitwise_or.reduce(LEGAL_BITS[pack_cols(boards)], axis=1)
+
+    legal = np.empty((len(boards), len(engine.MOVES)), dtype=bool)
+    legal[:, UP] = cols & 1
+    legal[:, DOWN] = cols & 2
+    legal[:, LEFT] = rows & 1
+    legal[:, RIGHT] = rows & 2
+    return legal
+
+
+def pack(boards):
+    """Convert (N, 4, 4) exponents into engine bitboards"""
+    flat = boards.reshape(len(boards), 16).astype(np.uint64)
+    shifts = np.arange(0, 64, 4, dtype=np.uint64)
+    return np.bitwise_or.reduce(flat << shifts, axis=1)
+
+
+def unpack(bitboards):
+    """Convert engine bitboards into (N, 4, 4) exponents"""
+    bitboards = np.asarray(bitboards, dtype=np.uint64)
+    shifts = np.arange(0, 64, 4, dtype=np.uint64)
+    flat = (bitboards[:, None] >> shifts) & np.uint64(0xF)
+    return flat.astype(np.uint8).reshape(len(bitboards), 4, 4)
+
+
+class BatchBoards:
+    """N independent 2048 games stepped together"""
+
+    def __init__(self, count, seed=None):
+        self.count = count
+        self.rng = np.random.default_rng(seed)
+
+        self.boards = np.zeros((count, 4, 4), dtype=np.uint8)
+        self.scores = np.zeros(count, dtype=np.int64)
+        self.rewards = np.zeros(count, dtype=np.int64)
+        self.done = np.zeros(count, dtype=bool)
+        self.legal = np.zeros((count, len(engine.MOVES)), dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Restart the boards selected by mask, all of them by default"""
+        if mask is None:
+            mask = np.ones(self.count, dtype=bool)
+        if not mask.any():
+            return
+
+        self.boards[mask] = 0
+        self.scores[mask] = 0
+        for _ in range(3):
+            self.spawn(mask)
+
+        self.legal[mask] = legal_mask(self.boards[mask])
+        self.done[mask] = ~self.legal[mask].any(axis=1)
+
+    def spawn(self, mask):
+        """Add a tile to a random empty cell of each masked board"""
+        flat = self.boards.reshape(self.count, 16)
+        empty = flat == 0
+        mask = mask & empty.any(axis=1)
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return
+
+        # -- random keys, occupied cells can never win the argmax
+        keys = self.rng.random((len(idx), 16))
+        keys[~empty[idx]] = -1.0
+        cells = keys.argmax(axis=1)
+
+        # -- 2 until a board reaches 1024, then 2 or 4
+        high = flat[idx].max(axis=1) >= 10
+        values = np.where(high, self.rng.integers(1, 3, len(idx)), 1)
+        flat[idx, cells] = values
+
+    def step(self, moves):
+        """
+        Apply one move per board.
+
+        Returns the running scores, the done mask and the (N, 4) legal-move
+        mask of the new boards. Illegal moves and finished boards are left
+        unchanged, ``rewards`` holds the score gained by this step.
+        """
+        moves = np.broadcast_to(np.asarray(moves), (self.count,))
+        new, rewards = apply_moves(self.boards, moves)
+
+        # -- finished boards and illegal moves leave the board untouched
+        new[self.done] = self.boards[self.done]
+        moved = (new != self.boards).any(axis=(1, 2))
+        rewards[~moved] = 0
+        self.boards = new
+        self.scores += rewards
+        self.rewards = rewards
+        self.spawn(moved)
+
+        self.legal = legal_mask(self.boards)
+        self.done = ~self.legal.any(axis=1)
+        return self.scores, self.done, self.legal
+
+    def bitboards(self):
+        """Engine bitboards of every board"""
+        return pack(self.boards)
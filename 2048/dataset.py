@@ -0,0 +1,247 @@
+"""
+Streaming export of 2048 trajectories to memory-mapped NumPy files.
+
+Transitions are fixed width records written in bulk into chunk files of a
+dataset directory. A small manifest holding the record count is replaced
+atomically after every flush, an interrupted export resumes from the last
+count it recorded. Games still running when an export stops, or at the
+count an interrupted export resumes from, are never continued, their last
+record is flagged truncated instead of done.
+
+Readers map the chunks and slice any range of records without loading the
+dataset into memory.
+"""
+import os
+import sys
+import json
+
+import numpy as np
+
+import batch
+
+RECORD = np.dtype(
+    [
+        ("state", "<u8"),
+        ("move", "u1"),
+        ("reward", "<u4"),
+        ("next_state", "<u8"),
+        ("done", "?"),
+        ("truncated", "?"),
+    ]
+)
+
+MANIFEST = "manifest.json"
+CHUNK_SIZE = 1 << 20
+FLUSH_EVERY = 1 << 16
+
+
+def chunk_path(path, index):
+    return os.path.join(path, "chunk-{:05d}.npy".format(index))
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST)) as file:
+        return json.load(file)
+
+
+def write_manifest(path, data):
+    tmp = os.path.join(path, MANIFEST + ".tmp")
+    with open(tmp, "w") as file:
+        json.dump(data, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, os.path.join(path, MANIFEST))
+
+
+class TrajectoryWriter:
+    """Append only writer, reopening an existing dataset resumes it"""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        if os.path.exists(os.path.join(path, MANIFEST)):
+            manifest = read_manifest(path)
+            self.chunk_size = manifest["chunk_size"]
+            self.count = manifest["count"]
+            self.tail = manifest.get("tail", 0)
+        else:
+            self.chunk_size = chunk_size
+            self.count = 0
+            self.tail = 0
+            write_manifest(path, self.manifest())
+
+        self.chunk = None
+        self.chunk_index = None
+
+    def open_chunk(self, index):
+        if self.chunk is not None:
+            self.chunk.flush()
+
+        path = chunk_path(self.path, index)
+        if os.path.exists(path):
+            self.chunk = np.load(path, mmap_mode="r+")
+        else:
+            self.chunk = np.lib.format.open_memmap(
+                path, mode="w+", dtype=RECORD, shape=(self.chunk_size,)
+            )
+        self.chunk_index = index
+
+    def manifest(self):
+        # -- tail is how many trailing records hold the last step of every
+        # -- game in flight, see mark_truncated
+        return {"chunk_size": self.chunk_size, "count": self.count, "tail": self.tail}
+
+    def mark_truncated(self, n):
+        """Flag the games of the last n records that did not finish"""
+        start = max(0, self.count - n)
+        while start < self.count:
+            index, offset = divmod(start, self.chunk_size)
+            if index != self.chunk_index:
+                self.open_chunk(index)
+            size = min(self.count - start, self.chunk_size - offset)
+            part = self.chunk[offset : offset + size]
+            part["truncated"] = ~part["done"]
+            start += size
+
+    def append(self, records):
+        """Copy a record array to the end of the dataset"""
+        done = 0
+        while done < len(records):
+            index, offset = divmod(self.count, self.chunk_size)
+            if index != self.chunk_index:
+                self.open_chunk(index)
+
+            size = min(len(records) - done, self.chunk_size - offset)
+            self.chunk[offset : offset + size] = records[done : done + size]
+            self.count += size
+            done += size
+
+    def flush(self):
+        """Make everything appended so far durable"""
+        if self.chunk is not None:
+            self.chunk.flush()
+        write_manifest(self.path, self.manifest())
+
+    def close(self):
+        self.flush()
+        self.chunk = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class TrajectoryDataset:
+    """Read only view over the records of a dataset directory"""
+
+    def __init__(self, path):
+        manifest = read_manifest(path)
+        self.chunk_size = manifest["chunk_size"]
+        self.count = manifest["count"]
+
+        nchunks = -(-self.count // self.chunk_size)
+        self.chunks = [
+            np.load(chunk_path(path, i), mmap_mode="r") for i in range(nchunks)
+        ]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            indices = range(*key.indices(self.count))
+            if not indices:
+                return np.empty(0, dtype=RECORD)
+            # -- one read of the span, the first and last index are its ends
+            lo, hi = min(indices[0], indices[-1]), max(indices[0], indices[-1])
+            span = self.read(lo, hi + 1)
+            return span if indices.step == 1 else span[:: indices.step]
+
+        if key < 0:
+            key += self.count
+        if not 0 <= key < self.count:
+            raise IndexError("record index out of range")
+        index, offset = divmod(key, self.chunk_size)
+        return self.chunks[index][offset]
+
+    def read(self, start, stop):
+        """Records in [start, stop), only the chunks touched are paged in"""
+        parts = []
+        while start < stop:
+            index, offset = divmod(start, self.chunk_size)
+            size = min(stop - start, self.chunk_size - offset)
+            parts.append(self.chunks[index][offset : offset + size])
+            start += size
+
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=RECORD)
+
+
+def random_policy(boards, rng):
+    """Uniformly random legal move for every board"""
+    keys = rng.random(boards.legal.shape)
+    keys[~boards.legal] = -1.0
+    return keys.argmax(axis=1)
+
+
+def export(
+    path,
+    transitions,
+    games=1024,
+    seed=None,
+    policy=random_policy,
+    chunk_size=CHUNK_SIZE,
+):
+    """
+    Play games headlessly until the dataset holds transitions records.
+
+    games boards are stepped together, finished boards restart at once.
+    policy maps a batch.BatchBoards and a generator to one move per board.
+    A resumed export starts new games, the ones it cut off are flagged
+    truncated, as are the games still running when it stops.
+    """
+    with TrajectoryWriter(path, chunk_size) as writer:
+        writer.mark_truncated(writer.tail)
+        writer.tail = games
+        rng = np.random.default_rng(None if seed is None else [seed, writer.count])
+        boards = batch.BatchBoards(games, rng.integers(1 << 63))
+        flushed = writer.count
+
+        while writer.count < transitions:
+            states = boards.bitboards()
+            moves = policy(boards, rng)
+            _, done, _ = boards.step(moves)
+
+            records = np.empty(games, dtype=RECORD)
+            records["state"] = states
+            records["move"] = moves
+            records["reward"] = boards.rewards
+            records["next_state"] = boards.bitboards()
+            records["done"] = done
+            records["truncated"] = False
+
+            writer.append(records[: transitions - writer.count])
+            boards.reset(done)
+
+            if writer.count - flushed >= FLUSH_EVERY:
+                writer.flush()
+                flushed = writer.count
+
+        writer.mark_truncated(games)
+
+
+def main():
+    cur_dir = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(cur_dir, "trajectories")
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    transitions = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+    export(path, transitions)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Bitboard engine for 2048.
+
+The 4x4 board is packed into a single 64 bit integer, one 4 bit nibble per
+cell holding the tile exponent (0 for empty, 1 for 2, 2 for 4 ...).
+Cell (x, y) lives at nibble ``y * 4 + x`` so every row is one 16 bit word.
+
+Moves are resolved with precomputed 65536 entry row tables, up/down moves
+transpose the board and reuse the same tables.
+"""
+import random
+
+ROW_MASK = 0xFFFF
+COL_MASK = 0x000F000F000F000F
+MAX_EXPONENT = 15
+
+UP, DOWN, LEFT, RIGHT = range(4)
+MOVES = (UP, DOWN, LEFT, RIGHT)
+
+# -- maps the (dx, dy) directions used by the game to engine moves
+DIRECTIONS = {(0, -1): UP, (0, 1): DOWN, (-1, 0): LEFT, (1, 0): RIGHT}
+
+
+def _reverse_row(row):
+    return (
+        ((row & 0xF) << 12)
+        | ((row & 0xF0) << 4)
+        | ((row >> 4) & 0xF0)
+        | ((row >> 12) & 0xF)
+    )
+
+
+def _unpack_col(row):
+    return (
+        (row & 0xF)
+        | ((row & 0xF0) << 12)
+        | ((row & 0xF00) << 24)
+        | ((row & 0xF000) << 36)
+    )
+
+
+def _slide_row(line):
+    """Slide and merge a list of four exponents towards index 0"""
+    tiles = [e for e in line if e]
+    result, score = [], 0
+    i = 0
+    while i < len(tiles):
+        e = tiles[i]
+        if i + 1 < len(tiles) and tiles[i + 1] == e:
+            # -- 32768 + 32768 stays at the representational limit
+            e = min(e + 1, MAX_EXPONENT)
+            score += 1 << e
+            i += 2
+        else:
+            i += 1
+        result.append(e)
+    result.extend([0] * (4 - len(result)))
+    return result, score
+
+
+def _build_tables():
+    row_left = [0] * 65536
+    row_right = [0] * 65536
+    col_up = [0] * 65536
+    col_down = [0] * 65536
+    row_score = [0] * 65536
+
+    for row in range(65536):
+        line = [(row >> (4 * i)) & 0xF for i in range(4)]
+        moved, score = _slide_row(line)
+        result = sum(e << (4 * i) for i, e in enumerate(moved))
+        rev_row, rev_result = _reverse_row(row), _reverse_row(result)
+
+        # -- tables hold the xor delta so unchanged rows cost nothing
+        row_left[row] = row ^ result
+        row_right[rev_row] = rev_row ^ rev_result
+        col_up[row] = _unpack_col(row) ^ _unpack_col(result)
+        col_down[rev_row] = _unpack_col(rev_row) ^ _unpack_col(rev_result)
+        row_score[row] = score
+
+    return row_left, row_right, col_up, col_down, row_score
+
+
+ROW_LEFT, ROW_RIGHT, COL_UP, COL_DOWN, ROW_SCORE = _build_tables()
+
+
+def transpose(board):
+    """Mirror the board along its main diagonal"""
+    a1 = board & 0xF0F00F0FF0F00F0F
+    a2 = board & 0x0000F0F00000F0F0
+    a3 = board & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def move_left(board):
+    return (
+        board
+        ^ ROW_LEFT[board & ROW_MASK]
+        ^ (ROW_LEFT[(board >> 16) & ROW_MASK] << 16)
+        ^ (ROW_LEFT[(board >> 32) & ROW_MASK] << 32)
+        ^ (ROW_LEFT[(board >> 48) & ROW_MASK] << 48)
+    )
+
+
+def move_right(board):
+    return (
+        board
+        ^ ROW_RIGHT[board & ROW_MASK]
+        ^ (ROW_RIGHT[(board >> 16) & ROW_MASK] << 16)
+        ^ (ROW_RIGHT[(board >> 32) & ROW_MASK] << 32)
+        ^ (ROW_RIGHT[(board >> 48) & ROW_MASK] << 48)
+    )
+
+
+def move_up(board):
+    t = transpose(board)
+    return (
+        board
+        ^ COL_UP[t & ROW_MASK]
+        ^ (COL_UP[(t >> 16) & ROW_MASK] << 4)
+        ^ (COL_UP[(t >> 32) & ROW_MASK] << 8)
+        ^ (COL_UP[(t >> 48) & ROW_MASK] << 12)
+    )
+
+
+def move_down(board):
+    t = transpose(board)
+    return (
+        board
+        ^ COL_DOWN[t & ROW_MASK]
+        ^ (COL_DOWN[(t >> 16) & ROW_MASK] << 4)
+        ^ (COL_DOWN[(t >> 32) & ROW_MASK] << 8)
+        ^ (COL_DOWN[(t >> 48) & ROW_MASK] << 12)
+    )
+
+
+def row_score(board):
+    """Score gained by merging every row horizontally"""
+    return (
+        ROW_SCORE[board & ROW_MASK]
+        + ROW_SCORE[(board >> 16) & ROW_MASK]
+        + ROW_SCORE[(board >> 32) & ROW_MASK]
+        + ROW_SCORE[(board >> 48) & ROW_MASK]
+    )
+
+
+def move(board, direction):
+    """Apply a move, returns the new board and the score it earned"""
+    if direction == LEFT:
+        return move_left(board), row_score(board)
+    if direction == RIGHT:
+        return move_right(board), row_score(board)
+    if direction == UP:
+        return move_up(board), row_score(transpose(board))
+    if direction == DOWN:
+        return move_down(board), row_score(transpose(board))
+    raise ValueError("Unknown move {}".format(direction))
+
+
+_MOVE_FUNCS = (move_up, move_down, move_left, move_right)
+
+
+def legal_moves(board):
+    """List the moves that change the board"""
+    return [m for m, func in zip(MOVES, _MOVE_FUNCS) if func(board) != board]
+
+
+def can_move(board):
+    """Check if any move changes the board"""
+    return (
+        move_left(board) != board
+        or move_right(board) != board
+        or move_up(board) != board
+        or move_down(board) != board
+    )
+
+
+def move_paths(board, direction):
+    """(from cell, to cell) nibble indices of every tile a move slides"""
+    if direction in (LEFT, RIGHT):
+        lines = [[y * 4 + x for x in range(4)] for y in range(4)]
+    else:
+        lines = [[y * 4 + x for y in range(4)] for x in range(4)]
+    if direction in (RIGHT, DOWN):
+        lines = [line[::-1] for line in lines]
+
+    paths = []
+    for line in lines:
+        target, last, merged = 0, 0, False
+        for cell in line:
+            e = (board >> (4 * cell)) & 0xF
+            if not e:
+                continue
+            if e == last and not merged:
+                paths.append((cell, line[target - 1]))
+                merged = True
+            else:
+                paths.append((cell, line[target]))
+                target += 1
+                merged = False
+            last = e
+    return paths
+
+
+def count_empty(board):
+    """Count the empty cells of the board"""
+    # -- fold every nibble into its lowest bit, set if the cell is occupied
+    board |= (board >> 2) & 0x3333333333333333
+    board |= board >> 1
+    board = ~board & 0x1111111111111111
+    return bin(board).count("1")
+
+
+def empty_cells(board):
+    """List the nibble indices of empty cells"""
+    return [i for i in range(16) if not (board >> (4 * i)) & 0xF]
+
+
+def max_exponent(board):
+    """Largest exponent on the board"""
+    best = 0
+    while board:
+        best = max(best, board & 0xF)
+        board >>= 4
+    return best
+
+
+def get_cell(board, x, y):
+    return (board >> (4 * (y * 4 + x))) & 0xF
+
+
+def set_cell(board, x, y, exponent):
+    shift = 4 * (y * 4 + x)
+    return (board & ~(0xF << shift)) | (exponent << shift)
+
+
+def spawn_exponent(board, rng=random):
+    """Exponent of the next tile, 2 until 1024 is reached then 2 or 4"""
+    if max_exponent(board) < 10:
+        return 1
+    return rng.choice((1, 2))
+
+
+def spawn(board, rng=random):
+    """Place a new tile on a random empty cell"""
+    cells = empty_cells(board)
+    if not cells:
+        return board
+    cell = rng.choice(cells)
+    return board | (spawn_exponent(board, rng) << (4 * cell))
+
+
+def new_board(count=3, rng=random):
+    """Create a board with count spawned tiles"""
+    board = 0
+    for _ in range(count):
+        board = spawn(board, rng)
+    return board
+
+
+def from_grid(grid):
+    """Pack a 4x4 grid of tile values (0 for empty) into a board"""
+    board = 0
+    for y, row in enumerate(grid):
+        for x, value in enumerate(row):
+            if value:
+                board = set_cell(board, x, y, value.bit_length() - 1)
+    return board
+
+
+def to_grid(board):
+    """Unpack a board into a 4x4 grid of tile values (0 for empty)"""
+    return [
+        [(1 << e) if e else 0 for e in (get_cell(board, x, y) for x in range(4))]
+        for y in range(4)
+    ]
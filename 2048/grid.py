@@ -0,0 +1,189 @@
+"""
+Board state for 2048 of any size.
+
+Grid keeps the exponents of a width x height board in a bytearray. A move
+walks every line once, so it is linear in the number of cells. The number
+of empty cells and of equal neighbouring pairs are kept up to date on every
+cell change, which makes the game over check O(1).
+
+BitGrid offers the same interface over the 4x4 bitboard engine, the solver
+and the other tools only understand that representation.
+"""
+import random
+
+import engine
+
+UP, DOWN, LEFT, RIGHT = engine.MOVES
+
+
+def make_grid(size):
+    """Fastest state for a board of size (width, height)"""
+    if tuple(size) == (4, 4):
+        return BitGrid()
+    return Grid(size)
+
+
+class Grid:
+    """Exponents of a width x height board, cell (x, y) at y * width + x"""
+
+    def __init__(self, size):
+        self.width, self.height = size
+        count = self.width * self.height
+
+        self.cells = bytearray(count)
+        self.empty = count
+        self.pairs = 0
+        self.max_exponent = 0
+        self.changed = set()
+
+        self.neighbours = [self.init_neighbours(i) for i in range(count)]
+        self.lines = self.init_lines()
+
+    def init_neighbours(self, index):
+        x, y = index % self.width, index // self.width
+        result = []
+        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                result.append(ny * self.width + nx)
+        return result
+
+    def init_lines(self):
+        """Cell indices of every line, ordered towards the edge tiles move to"""
+        w, h = self.width, self.height
+        rows = [[y * w + x for x in range(w)] for y in range(h)]
+        cols = [[y * w + x for y in range(h)] for x in range(w)]
+        return {
+            LEFT: rows,
+            RIGHT: [line[::-1] for line in rows],
+            UP: cols,
+            DOWN: [line[::-1] for line in cols],
+        }
+
+    def get(self, x, y):
+        return self.cells[y * self.width + x]
+
+    def set(self, index, exponent):
+        """Change one cell and keep the empty and pair counts in sync"""
+        cells = self.cells
+        old = cells[index]
+        if old == exponent:
+            return
+
+        for n in self.neighbours[index]:
+            if old and cells[n] == old:
+                self.pairs -= 1
+            if exponent and cells[n] == exponent:
+                self.pairs += 1
+
+        self.empty += (not exponent) - (not old)
+        self.max_exponent = max(self.max_exponent, exponent)
+        cells[index] = exponent
+        self.changed.add(index)
+
+    def clear(self):
+        for index in range(len(self.cells)):
+            self.set(index, 0)
+        self.max_exponent = 0
+
+    def pack(self):
+        """The whole board as one integer, a byte per cell"""
+        return int.from_bytes(self.cells, "little")
+
+    def unpack(self, value):
+        cells = value.to_bytes(len(self.cells), "little")
+        for index, e in enumerate(cells):
+            self.set(index, e)
+        self.max_exponent = max(cells)
+
+    def move(self, direction):
+        """
+        Slide every line towards direction.
+
+        Returns (moved, score, paths) where paths holds a (from cell,
+        to cell, exponent) triple for every tile that took part.
+        """
+        cells = self.cells
+        score, paths = 0, []
+        moved = False
+
+        for line in self.lines[direction]:
+            result = []
+            merged = True
+            for cell in line:
+                e = cells[cell]
+                if not e:
+                    continue
+                if not merged and result[-1] == e:
+                    result[-1] = e + 1
+                    score += 1 << (e + 1)
+                    merged = True
+                else:
+                    result.append(e)
+                    merged = False
+                paths.append((cell, line[len(result) - 1], e))
+
+            result.extend([0] * (len(line) - len(result)))
+            for cell, e in zip(line, result):
+                if cells[cell] != e:
+                    self.set(cell, e)
+                    moved = True
+
+        if not moved:
+            return False, 0, []
+        return True, score, paths
+
+    def spawn(self, rng=random):
+        """Place a new tile on a random empty cell, see engine.spawn"""
+        if not self.empty:
+            return
+        empty = [i for i, e in enumerate(self.cells) if not e]
+        exponent = 1 if self.max_exponent < 10 else rng.choice((1, 2))
+        self.set(rng.choice(empty), exponent)
+
+    def can_move(self):
+        return bool(self.empty or self.pairs)
+
+
+class BitGrid:
+    """Grid interface over a 4x4 engine bitboard"""
+
+    def __init__(self):
+        self.width = self.height = 4
+        self.state = 0
+        self.changed = set()
+
+    def get(self, x, y):
+        return engine.get_cell(self.state, x, y)
+
+    def update_state(self, state):
+        diff = self.state ^ state
+        self.changed.update(i for i in range(16) if (diff >> (4 * i)) & 0xF)
+        self.state = state
+
+    def clear(self):
+        self.update_state(0)
+
+    def pack(self):
+        return self.state
+
+    def unpack(self, value):
+        self.update_state(value)
+
+    def move(self, direction):
+        state, score = engine.move(self.state, direction)
+        if state == self.state:
+            return False, 0, []
+
+        paths = [
+            (src, dst, (self.state >> (4 * src)) & 0xF)
+            for src, dst in engine.move_paths(self.state, direction)
+        ]
+        self.update_state(state)
+        return True, score, paths
+
+    def spawn(self, rng=random):
+        self.update_state(engine.spawn(self.state, rng))
+
+    def can_move(self):
+        return engine.can_move(self.state)
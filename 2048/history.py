@@ -0,0 +1,158 @@
+"""
+Move history and autosave for 2048.
+
+History keeps every board state as a packed integer plus score in a ring
+buffer that grows with the game up to a fixed size, undo and redo only
+move a cursor. 4x4 bitboards are stored in typed arrays, a u64 state and
+a u32 score, so a million moves take 12 MB and a short game a few KB.
+
+AutoSaver writes the latest state to a small binary file from a background
+thread, the file is replaced by an atomic rename so a crash never leaves a
+half written save behind.
+"""
+import os
+import struct
+import threading
+from array import array
+
+HISTORY_SIZE = 1 << 20
+
+# -- magic, width, height, score, highscore, length of the packed state
+SAVE_HEADER = struct.Struct("<4sHHQQH")
+SAVE_MAGIC = b"2048"
+
+
+class History:
+    """Ring buffer of (packed state, score) with undo and redo"""
+
+    def __init__(self, capacity=HISTORY_SIZE, compact=True):
+        self.capacity = capacity
+        # -- filled by push, slots only get reused once capacity is reached
+        if compact:
+            self.states = array("Q")
+            self.scores = array("I")
+        else:
+            self.states = []
+            self.scores = []
+
+        # -- absolute indices, slots are index % capacity
+        self.start = 0
+        self.cursor = -1
+        self.end = 0
+
+    def __len__(self):
+        return self.end - self.start
+
+    def clear(self):
+        self.start, self.cursor, self.end = 0, -1, 0
+
+    def get(self, index):
+        slot = index % self.capacity
+        return self.states[slot], self.scores[slot]
+
+    def push(self, state, score):
+        """Record a new state after the cursor, drops everything to redo"""
+        self.cursor += 1
+        self.end = self.cursor + 1
+        if self.end - self.start > self.capacity:
+            self.start = self.end - self.capacity
+
+        slot = self.cursor % self.capacity
+        if slot == len(self.states):
+            self.states.append(state)
+            self.scores.append(score)
+        else:
+            self.states[slot] = state
+            self.scores[slot] = score
+
+    def undo(self):
+        """Step back, returns the previous (state, score) or None"""
+        if self.cursor <= self.start:
+            return None
+        self.cursor -= 1
+        return self.get(self.cursor)
+
+    def redo(self):
+        """Step forward, returns the next (state, score) or None"""
+        if self.cursor + 1 >= self.end:
+            return None
+        self.cursor += 1
+        return self.get(self.cursor)
+
+
+def encode_save(size, state, score, highscore):
+    width, height = size
+    packed = state.to_bytes(max(1, (state.bit_length() + 7) // 8), "little")
+    header = SAVE_HEADER.pack(
+        SAVE_MAGIC, width, height, score, highscore, len(packed)
+    )
+    return header + packed
+
+
+def load_save(path):
+    """Returns (size, state, score, highscore) or None without a valid save"""
+    try:
+        with open(path, "rb") as file:
+            data = file.read()
+        header = SAVE_HEADER.unpack_from(data)
+    except (OSError, struct.error):
+        return None
+
+    magic, width, height, score, highscore, length = header
+    packed = data[SAVE_HEADER.size : SAVE_HEADER.size + length]
+    if magic != SAVE_MAGIC or len(packed) != length:
+        return None
+    return (width, height), int.from_bytes(packed, "little"), score, highscore
+
+
+class AutoSaver:
+    """Write-behind saves, only the latest submitted state is written"""
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = None
+        self.last = None
+        self.running = True
+
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, size, state, score, highscore):
+        """Hand over a state to save, never blocks on disk"""
+        entry = (tuple(size), state, score, highscore)
+        if entry == self.last:
+            return
+        self.last = entry
+        with self.condition:
+            self.pending = entry
+            self.condition.notify()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and self.running:
+                    self.condition.wait()
+                entry, self.pending = self.pending, None
+                if entry is None:
+                    return
+            self.write(entry)
+
+    def write(self, entry):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "wb") as file:
+                file.write(encode_save(*entry))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp, self.path)
+        except (OSError, struct.error):
+            # -- a save that can't be written must not kill the thread
+            pass
+
+    def close(self, timeout=1.0):
+        """Write what is pending and stop the thread"""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join(timeout)
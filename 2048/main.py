@@ -0,0 +1,544 @@
+import os
+import sys
+import math
+import pickle
+import random
+import pygame as pg
+from pathlib import Path
+from functools import lru_cache
+from collections import deque
+
+import grid
+import engine
+import solver
+import history
+
+
+CAPTION = "2048"
+SIZE = 500, 600
+BOARD_POS = 50, 150
+BOARD_SIZE = 400, 400
+BOARD_CELLS = 4
+FPS = 60
+
+# -- moves queued while a slide animates, extra key presses are dropped
+MOVE_QUEUE = 4
+
+# -- expectimax settings for hints and autoplay
+SOLVER_DEPTH = 3
+SOLVER_TIME = 0.1
+
+colors = {
+    2: pg.Color("red"),
+    4: pg.Color("blue"),
+    8: pg.Color("yellow"),
+    16: pg.Color("green"),
+    32: pg.Color("violet"),
+    64: pg.Color("purple"),
+    128: pg.Color("magenta"),
+    256: pg.Color("orange"),
+    512: pg.Color("tomato"),
+    1024: pg.Color("brown"),
+    2048: pg.Color("cyan"),
+    4096: pg.Color("lavender"),
+}
+
+action_map = [
+    {"keys": [pg.K_w, pg.K_UP], "direction": (0, -1)},
+    {"keys": [pg.K_s, pg.K_DOWN], "direction": (0, 1)},
+    {"keys": [pg.K_a, pg.K_LEFT], "direction": (-1, 0)},
+    {"keys": [pg.K_d, pg.K_RIGHT], "direction": (1, 0)},
+]
+
+move_names = {
+    engine.UP: "Up",
+    engine.DOWN: "Down",
+    engine.LEFT: "Left",
+    engine.RIGHT: "Right",
+}
+move_directions = {m: d for d, m in engine.DIRECTIONS.items()}
+
+
+def main():
+    pg.init()
+    pg.display.set_caption(CAPTION)
+    screen = pg.display.set_mode(SIZE, 0, 32)
+    clock = pg.time.Clock()
+
+    cells = int(sys.argv[1]) if len(sys.argv) > 1 else BOARD_CELLS
+    board = Board((cells, cells))
+
+    # -- resume the last game when it was played on the same board size
+    hscore = 0
+    save = history.load_save(data_path())
+    if save:
+        size, state, score, hscore = save
+        if size == board.size:
+            board.restore(state, score)
+            board.history.clear()
+            board.history.push(state, score)
+    else:
+        hscore = load_highscore()
+    saver = history.AutoSaver(data_path())
+
+    hinter = None
+    show_hint = False
+    autoplay = False
+
+    gameover = False
+    while True:
+        # Events
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                quit_game(saver, hinter)
+
+            if event.type == pg.KEYDOWN:
+                if event.key == pg.K_ESCAPE:
+                    quit_game(saver, hinter)
+
+                if event.key == pg.K_u:
+                    board.undo()
+                    gameover = board.full
+                if event.key == pg.K_r:
+                    board.redo()
+                    gameover = board.full
+
+                if gameover:
+                    if event.key == pg.K_SPACE:
+                        board.reset()
+                        gameover = False
+                    continue
+
+                if event.key == pg.K_h:
+                    show_hint = not show_hint
+                if event.key == pg.K_p:
+                    autoplay = not autoplay
+
+                for action in action_map:
+                    if event.key in action.get("keys"):
+                        board.set_direction(action.get("direction"))
+
+        # Draw
+        screen.fill((100, 100, 100))
+
+        draw_title(screen)
+        draw_score(screen, board.score)
+        draw_highscore(screen, hscore)
+        board.draw(screen)
+
+        # -- solver runs in another process, only pick up finished searches
+        # -- it only knows the 4x4 bitboard
+        hint = None
+        if (show_hint or autoplay) and not gameover and board.state is not None:
+            if hinter is None:
+                hinter = solver.HintWorker(SOLVER_DEPTH, SOLVER_TIME)
+            hinter.request(board.state)
+            hint = hinter.poll()
+
+        if hint and hint.move is not None:
+            if show_hint:
+                draw_hint(screen, hint)
+            if autoplay:
+                board.set_direction(move_directions[hint.move])
+
+        if gameover:
+            draw_gameover(screen, board.score)
+
+        pg.display.flip()
+
+        # Update
+        dt = clock.tick(FPS) / 1000.0
+        board.update(dt)
+        hscore = max(hscore, board.score)
+        saver.submit(board.size, board.grid.pack(), board.score, hscore)
+
+        if board.full:
+            gameover = True
+
+
+def quit_game(saver, hinter=None):
+    """Finish the last save and stop the solver process, then exit"""
+    saver.close()
+    if hinter:
+        hinter.close()
+    sys.exit()
+
+
+@lru_cache(maxsize=None)
+def get_font(size, bold=False, italic=False):
+    font = pg.font.Font(pg.font.match_font("arial"), size)
+    font.set_bold(bold)
+    font.set_italic(italic)
+    return font
+
+
+def draw_hint(surface, hint):
+    ifont = get_font(20)
+    sfont = get_font(10)
+
+    itsurface = ifont.render(move_names[hint.move], True, pg.Color("white"))
+    stsurface = sfont.render(
+        "Hint  depth {}  {:.0f} nodes/s".format(hint.depth, hint.nodes_per_second),
+        True,
+        pg.Color("white"),
+    )
+
+    itrect = itsurface.get_rect(topleft=(10, 20))
+    strect = stsurface.get_rect(topleft=(10, 10))
+
+    bgrect = pg.Rect(0, 0, 70, 25)
+    bgrect.topleft = (10, 20)
+    pg.draw.rect(surface, pg.Color("gray"), bgrect)
+    surface.blit(itsurface, itrect)
+    surface.blit(stsurface, strect)
+
+
+def draw_title(surface):
+    font = get_font(40)
+
+    tsurface = font.render(CAPTION, True, pg.Color("white"))
+    text_rect = tsurface.get_rect()
+    text_rect.midtop = (250, 10)
+
+    surface.blit(tsurface, text_rect)
+    pg.draw.line(surface, pg.Color("white"), (0, 100), (500, 100), 3)
+
+
+def draw_score(surface, score):
+    ifont = get_font(20)
+    sfont = get_font(10)
+
+    itsurface = ifont.render(str(score), True, pg.Color("white"))
+    stsurface = sfont.render("Score", True, pg.Color("white"))
+
+    itrect = itsurface.get_rect(topright=(490, 20))
+    strect = stsurface.get_rect(topright=(490, 10))
+
+    bgrect = pg.Rect(0, 0, 70, 25)
+    bgrect.topright = (490, 20)
+    pg.draw.rect(surface, pg.Color("gray"), bgrect)
+    surface.blit(itsurface, itrect)
+    surface.blit(stsurface, strect)
+
+
+def draw_highscore(surface, hscore=0):
+    ifont = get_font(20)
+    sfont = get_font(10)
+
+    itsurface = ifont.render(str(hscore), True, pg.Color("white"))
+    stsurface = sfont.render("High Score", True, pg.Color("white"))
+
+    itrect = itsurface.get_rect(topright=(490, 62))
+    strect = stsurface.get_rect(topright=(490, 50))
+
+    bgrect = pg.Rect(0, 0, 70, 25)
+    bgrect.topright = (490, 62)
+    pg.draw.rect(surface, pg.Color("gray"), bgrect)
+    surface.blit(itsurface, itrect)
+    surface.blit(stsurface, strect)
+
+
+def data_path():
+    cur_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(cur_dir, "2048.save")
+
+
+def load_highscore():
+    """High score of the old pickled data file, used once to migrate"""
+    cur_dir = os.path.dirname(os.path.abspath(__file__))
+    data_file = os.path.join(cur_dir, "2048.data")
+    if Path(data_file).exists():
+        return pickle.load(open(data_file, "rb"))["highscore"]
+    else:
+        return 0
+
+
+def draw_gameover(surface, score):
+    pg.draw.rect(surface, pg.Color("white"), [0, 0, SIZE[0], SIZE[1]])
+
+    # -- Draw Game Over Text
+    font = get_font(40, bold=True)
+
+    tsurface = font.render("GAME OVER", True, pg.Color("black"))
+    text_rect = tsurface.get_rect()
+    text_rect.center = (SIZE[0] // 2, 100)
+    surface.blit(tsurface, text_rect)
+
+    # -- Draw score text
+    font = get_font(20, bold=True)
+
+    tsurface = font.render("Your Score " + str(score), True, pg.Color("black"))
+    text_rect = tsurface.get_rect()
+    text_rect.center = (SIZE[0] // 2, 200)
+    surface.blit(tsurface, text_rect)
+
+    # -- Draw instructions
+    font = get_font(12, bold=True, italic=True)
+
+    tsurface = font.render(
+        "Press Escape to QUIT, Space to RESTART", True, pg.Color("black")
+    )
+    text_rect = tsurface.get_rect()
+    text_rect.center = (SIZE[0] // 2, SIZE[1] - 20)
+    surface.blit(tsurface, text_rect)
+
+
+class TileAtlas:
+    """Pre-rendered tile surfaces, one per (value, tile size)"""
+
+    def __init__(self, font_size=40):
+        self.font_size = font_size
+        self.surfaces = {}
+
+    def font(self, size):
+        return get_font(size)
+
+    def color(self, value):
+        """Tile colour, values past the colors table get a generated one"""
+        if value not in colors:
+            color = pg.Color(0)
+            color.hsva = ((value.bit_length() * 47) % 360, 60, 80, 100)
+            colors[value] = color
+        return colors[value]
+
+    def make_surface(self, value, size):
+        surf = pg.Surface(size).convert()
+        surf.fill(self.color(value))
+
+        # -- shrink the font until the number fits the tile
+        text = str(value)
+        font_size = self.font_size
+        width, height = self.font(font_size).size(text)
+        room_x, room_y = size[0] - min(10, size[0] // 5), size[1] * 0.8
+        if width > room_x or height > room_y:
+            scale = min(room_x / width, room_y / height)
+            font_size = max(6, int(font_size * scale))
+
+        tsurface = self.font(font_size).render(text, True, pg.Color("white"))
+        surf.blit(tsurface, tsurface.get_rect(center=surf.get_rect().center))
+        return surf
+
+    def get(self, value, size):
+        key = value, (int(size[0]), int(size[1]))
+        surf = self.surfaces.get(key)
+        if surf is None:
+            surf = self.surfaces[key] = self.make_surface(*key)
+        return surf
+
+
+atlas = TileAtlas()
+
+
+class Tile:
+    """Tile methods and properties"""
+
+    def __init__(self, value, size, position):
+        """Initialize a tile object"""
+        self.value = value
+        self.size = size
+        self.pos = position
+
+        self.move_target = None
+        self.move_speed = 2500
+
+    def draw(self, surface):
+        """Draw tile object"""
+        surface.blit(atlas.get(self.value, self.size), self.pos)
+
+    def update(self, dt):
+        """Slide towards move_target"""
+        if self.move_target is None:
+            return
+
+        px, py = self.pos
+        tx, ty = self.move_target
+        dist = math.hypot(tx - px, ty - py)
+        step = self.move_speed * dt
+        if step >= dist:
+            self.pos = self.move_target
+            self.move_target = None
+        else:
+            self.pos = px + (tx - px) * step / dist, py + (ty - py) * step / dist
+
+
+class Board:
+    """Board methods and properties, a view over the grid state"""
+
+    def __init__(self, size):
+        """Initalize the board object"""
+        self.size = size
+        self.rng = random.Random()
+        self.grid = grid.make_grid(size)
+
+        self.rect = pg.Rect(BOARD_POS, BOARD_SIZE)
+        self.cell_size = [s / c for s, c in zip(BOARD_SIZE, self.size)]
+        self.margin = max(1, int(min(self.cell_size) * 0.05))
+
+        self.background = self.make_board_background()
+        self.positions = self.init_positions()
+        self.tiles = self.init_tiles()
+        self.sliding = []
+        self.moves = deque(maxlen=MOVE_QUEUE)
+        self.score = 0
+        self.full = False
+
+        # -- bitboards fit a typed array, larger boards keep fewer states
+        cells = size[0] * size[1]
+        compact = isinstance(self.grid, grid.BitGrid)
+        capacity = history.HISTORY_SIZE
+        if not compact:
+            capacity = max(1024, (1 << 24) // cells)
+        self.history = history.History(capacity, compact)
+
+        self.add_tile(3)
+        self.history.push(self.grid.pack(), self.score)
+
+    @property
+    def state(self):
+        """Engine bitboard, only 4x4 boards have one"""
+        return getattr(self.grid, "state", None)
+
+    def set_direction(self, d):
+        """Queue a move, it is applied on the next update"""
+        self.moves.append(d)
+
+    def make_board_background(self):
+        """Create the background for the board"""
+        s = pg.Surface(BOARD_SIZE).convert_alpha()
+        s.fill(pg.Color("grey"))
+
+        w = self.margin
+        cx, cy = self.size
+        sx, sy = self.cell_size
+        for x in range(cx):
+            for y in range(cy):
+                pg.draw.rect(s, pg.Color("white"), [x * sx, y * sy, sx, sy], w)
+        return s
+
+    def init_tiles(self):
+        """Initialize tiles for the board"""
+        sx, sy = self.size
+        return [[None for _ in range(sx)] for _ in range(sy)]
+
+    def init_positions(self):
+        """Initialize positions for tiles on the board"""
+        cx, cy = self.size
+        sx, sy = self.cell_size
+        offx, offy = self.rect.x + self.margin, self.rect.y + self.margin
+
+        return [
+            [(int(offx + x * sx), int(offy + y * sy)) for x in range(cx)]
+            for y in range(cy)
+        ]
+
+    def tile_size(self):
+        return [s - 2 * self.margin for s in self.cell_size]
+
+    def sync_tiles(self):
+        """Mirror the cells changed since the last sync into the tiles"""
+        tsize = self.tile_size()
+        cx, _ = self.size
+        for index in self.grid.changed:
+            x, y = index % cx, index // cx
+            e = self.grid.get(x, y)
+            tile = self.tiles[y][x]
+            if not e:
+                self.tiles[y][x] = None
+            elif tile:
+                tile.value = 1 << e
+            else:
+                self.tiles[y][x] = Tile(1 << e, tsize, self.positions[y][x])
+        self.grid.changed.clear()
+
+    def add_tile(self, count=1):
+        """Add count number of tiles to the board"""
+        for _ in range(count):
+            self.grid.spawn(self.rng)
+        self.sync_tiles()
+
+    def reset(self):
+        """Reset board"""
+        self.grid.clear()
+        self.sliding = []
+        self.moves.clear()
+        self.score = 0
+        self.full = False
+
+        self.add_tile(3)
+        self.history.clear()
+        self.history.push(self.grid.pack(), self.score)
+
+    def restore(self, state, score):
+        """Jump to a packed state, drops any animation and queued moves"""
+        self.grid.unpack(state)
+        self.sync_tiles()
+        self.sliding = []
+        self.moves.clear()
+        self.score = score
+        self.full = self.check_no_mergable()
+
+    def undo(self):
+        entry = self.history.undo()
+        if entry:
+            self.restore(*entry)
+
+    def redo(self):
+        entry = self.history.redo()
+        if entry:
+            self.restore(*entry)
+
+    def check_no_mergable(self):
+        """Ensure no tiles in board can be merged"""
+        return not self.grid.can_move()
+
+    def draw(self, screen):
+        """Draw the board"""
+        # -- background
+        screen.blit(self.background, self.rect)
+
+        # -- tiles, sliding ones until the last move finished animating
+        if self.sliding:
+            for tile in self.sliding:
+                tile.draw(screen)
+        else:
+            for tile in [t for row in self.tiles for t in row if t]:
+                tile.draw(screen)
+
+    def apply_move(self, direction):
+        """Resolve a whole move at once and start its slide animation"""
+        moved, score, paths = self.grid.move(engine.DIRECTIONS[direction])
+        if not moved:
+            return
+
+        # -- tiles keep their old value while sliding, merges show at the end
+        tsize = self.tile_size()
+        cx, _ = self.size
+        self.sliding = []
+        for src, dst, e in paths:
+            sx, sy = src % cx, src // cx
+            dx, dy = dst % cx, dst // cx
+
+            tile = Tile(1 << e, tsize, self.positions[sy][sx])
+            tile.move_target = self.positions[dy][dx]
+            self.sliding.append(tile)
+
+        self.score += score
+        self.add_tile()
+        self.history.push(self.grid.pack(), self.score)
+
+        if self.check_no_mergable():
+            self.full = True
+
+    def update(self, dt):
+        """Apply one queued move and advance the slide animation"""
+        if self.moves:
+            self.apply_move(self.moves.popleft())
+
+        for tile in self.sliding:
+            tile.update(dt)
+        if all(tile.move_target is None for tile in self.sliding):
+            self.sliding = []
+
+
+if __name__ == "__main__":
+    main()
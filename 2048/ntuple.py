@@ -0,0 +1,194 @@
+"""
+N-tuple network evaluator for 2048, trained by temporal difference learning.
+
+Every pattern is a tuple of cells, the exponents found on those cells index
+into a weight table. Each pattern is applied under the 8 symmetries of the
+board and the value of a board is the sum of all the weights it selects.
+
+Weights of all patterns live in one flat float32 array which is saved as a
+.npy file and loaded back through a memory map.
+"""
+import os
+import sys
+import random
+
+import numpy as np
+
+import engine
+
+# -- straight lines and squares, cells are numbered y * 4 + x
+PATTERNS = (
+    (0, 1, 2, 3),
+    (4, 5, 6, 7),
+    (0, 1, 4, 5),
+    (1, 2, 5, 6),
+    (5, 6, 9, 10),
+)
+
+WEIGHTS_FILE = "2048.ntuple.npy"
+
+
+def symmetries():
+    """The 8 cell permutations mapping a board onto its symmetric variants"""
+    perms = []
+    for transpose in (False, True):
+        for flip_x in (False, True):
+            for flip_y in (False, True):
+                perm = []
+                for cell in range(16):
+                    x, y = cell % 4, cell // 4
+                    if transpose:
+                        x, y = y, x
+                    if flip_x:
+                        x = 3 - x
+                    if flip_y:
+                        y = 3 - y
+                    perm.append(y * 4 + x)
+                perms.append(perm)
+    return perms
+
+
+def weights_size(patterns):
+    return sum(16 ** len(p) for p in patterns)
+
+
+class NTupleNetwork:
+    """Board evaluator backed by one flat weight array"""
+
+    def __init__(self, patterns=PATTERNS, weights=None):
+        self.patterns = patterns
+        if weights is None:
+            weights = np.zeros(weights_size(patterns), dtype=np.float32)
+        if len(weights) != weights_size(patterns):
+            raise ValueError("Weights do not match the n-tuple patterns")
+        self.weights = weights
+
+        # -- (table offset, cells) for every pattern under every symmetry
+        self.features = []
+        offset = 0
+        for pattern in patterns:
+            for perm in symmetries():
+                self.features.append((offset, [perm[c] for c in pattern]))
+            offset += 16 ** len(pattern)
+
+    @classmethod
+    def load(cls, path, patterns=PATTERNS, mode="r+"):
+        """Open saved weights as a memory map, writes go back to the file"""
+        return cls(patterns, np.load(path, mmap_mode=mode))
+
+    @classmethod
+    def create(cls, path, patterns=PATTERNS):
+        """Create a zeroed weight file and map it"""
+        weights = np.lib.format.open_memmap(
+            path, mode="w+", dtype=np.float32, shape=(weights_size(patterns),)
+        )
+        return cls(patterns, weights)
+
+    def save(self, path=None):
+        """Flush a mapped network, or write the weights to path"""
+        if path is None:
+            self.weights.flush()
+        else:
+            np.save(path, self.weights)
+
+    def indices(self, board):
+        """Weight indices selected by a board"""
+        cells = [(board >> (4 * i)) & 0xF for i in range(16)]
+        result = []
+        for offset, tup in self.features:
+            index = 0
+            for c in tup:
+                index = (index << 4) | cells[c]
+            result.append(offset + index)
+        return result
+
+    def value(self, board):
+        return float(self.weights[self.indices(board)].sum())
+
+    __call__ = value
+
+    def update(self, board, delta):
+        """Spread delta over all the weights selected by board"""
+        np.add.at(self.weights, self.indices(board), delta / len(self.features))
+
+    def best_move(self, board):
+        """
+        Greedy one ply player.
+
+        Returns (move, reward, afterstate) maximising reward plus the value
+        of the afterstate, move is None when the game is over.
+        """
+        best, best_value = (None, 0, board), None
+        for move in engine.MOVES:
+            after, reward = engine.move(board, move)
+            if after == board:
+                continue
+            value = reward + self.value(after)
+            if best_value is None or value > best_value:
+                best, best_value = (move, reward, after), value
+        return best
+
+
+def play(network, rng=random, learning_rate=0.0):
+    """
+    Play one game greedily, returns the final score and board.
+
+    With a learning rate the network is updated by TD(0) on afterstates:
+    each afterstate moves towards the next reward plus the value of the
+    next afterstate, the last one towards zero.
+    """
+    board = engine.new_board(rng=rng)
+    score = 0
+    prev = None
+
+    while True:
+        move, reward, after = network.best_move(board)
+        if move is None:
+            break
+
+        if learning_rate and prev is not None:
+            error = reward + network.value(after) - network.value(prev)
+            network.update(prev, learning_rate * error)
+
+        score += reward
+        prev = after
+        board = engine.spawn(after, rng)
+
+    if learning_rate and prev is not None:
+        network.update(prev, -learning_rate * network.value(prev))
+    return score, board
+
+
+def train(network, episodes, learning_rate=0.1, rng=random, report=1000):
+    """Self play episodes, prints the running average every report games"""
+    scores = []
+    for episode in range(1, episodes + 1):
+        score, _ = play(network, rng, learning_rate)
+        scores.append(score)
+
+        if report and not episode % report:
+            recent = scores[-report:]
+            print(
+                "episode {}  mean score {:.0f}  max score {}".format(
+                    episode, sum(recent) / len(recent), max(recent)
+                )
+            )
+    return scores
+
+
+def main():
+    cur_dir = os.path.dirname(os.path.abspath(__file__))
+    path = os.path.join(cur_dir, WEIGHTS_FILE)
+    episodes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    if os.path.exists(path):
+        network = NTupleNetwork.load(path)
+    else:
+        network = NTupleNetwork.create(path)
+
+    train(network, episodes)
+    network.save()
+
+
+if __name__ == "__main__":
+    main()
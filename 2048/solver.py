@@ -0,0 +1,298 @@
+"""
+Expectimax solver for 2048.
+
+Searches alternating move (max) and spawn (chance) nodes over engine
+bitboards. Chance nodes are cached in a bounded transposition table keyed
+by the canonical form of the board under the 8 symmetries of the square.
+
+HintWorker runs searches in a process pool so the game loop never waits
+on the solver.
+"""
+import time
+import functools
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+import engine
+
+# -- heuristic weights, see _row_heuristic
+LOST_PENALTY = 200000.0
+MONOTONICITY_POWER = 4.0
+MONOTONICITY_WEIGHT = 47.0
+SUM_POWER = 3.5
+SUM_WEIGHT = 11.0
+MERGES_WEIGHT = 700.0
+EMPTY_WEIGHT = 270.0
+
+
+def _row_heuristic(row):
+    line = [(row >> (4 * i)) & 0xF for i in range(4)]
+
+    total = sum(e ** SUM_POWER for e in line)
+    empty = line.count(0)
+
+    # -- count runs of equal tiles that could merge
+    merges, prev, counter = 0, 0, 0
+    for e in line:
+        if not e:
+            continue
+        if e == prev:
+            counter += 1
+        elif counter:
+            merges += 1 + counter
+            counter = 0
+        prev = e
+    if counter:
+        merges += 1 + counter
+
+    # -- penalise rows that are not monotonic in either direction
+    mono_left = mono_right = 0.0
+    for a, b in zip(line, line[1:]):
+        pa, pb = a ** MONOTONICITY_POWER, b ** MONOTONICITY_POWER
+        if a > b:
+            mono_left += pa - pb
+        else:
+            mono_right += pb - pa
+
+    return (
+        LOST_PENALTY
+        + EMPTY_WEIGHT * empty
+        + MERGES_WEIGHT * merges
+        - MONOTONICITY_WEIGHT * min(mono_left, mono_right)
+        - SUM_WEIGHT * total
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def heuristic_table():
+    """Heuristic score of every 16 bit row, built once by Solver"""
+    return [_row_heuristic(row) for row in range(65536)]
+
+
+def evaluate(board):
+    """Static evaluation of a board, rows and columns scored alike"""
+    table = heuristic_table()
+    t = engine.transpose(board)
+    return (
+        table[board & 0xFFFF]
+        + table[(board >> 16) & 0xFFFF]
+        + table[(board >> 32) & 0xFFFF]
+        + table[board >> 48]
+        + table[t & 0xFFFF]
+        + table[(t >> 16) & 0xFFFF]
+        + table[(t >> 32) & 0xFFFF]
+        + table[t >> 48]
+    )
+
+
+def flip_rows(board):
+    """Mirror the board left to right"""
+    return (
+        ((board & 0x000F000F000F000F) << 12)
+        | ((board & 0x00F000F000F000F0) << 4)
+        | ((board >> 4) & 0x00F000F000F000F0)
+        | ((board >> 12) & 0x000F000F000F000F)
+    )
+
+
+def flip_cols(board):
+    """Mirror the board top to bottom"""
+    return (
+        ((board & 0xFFFF) << 48)
+        | ((board & 0xFFFF0000) << 16)
+        | ((board >> 16) & 0xFFFF0000)
+        | (board >> 48)
+    )
+
+
+def canonical(board):
+    """Smallest of the 8 symmetric variants of a board"""
+    t = engine.transpose(board)
+    v, tv = flip_cols(board), flip_cols(t)
+    return min(
+        board,
+        flip_rows(board),
+        v,
+        flip_rows(v),
+        t,
+        flip_rows(t),
+        tv,
+        flip_rows(tv),
+    )
+
+
+def spawn_chances(board):
+    """(exponent, probability) pairs of the next spawn, see engine.spawn"""
+    if engine.max_exponent(board) < 10:
+        return ((1, 1.0),)
+    return ((1, 0.5), (2, 0.5))
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+@dataclass
+class SearchResult:
+    board: int
+    move: int
+    depth: int
+    nodes: int
+    elapsed: float
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed else 0.0
+
+
+class Solver:
+    """Depth limited expectimax search with a bounded transposition table"""
+
+    def __init__(
+        self,
+        depth=3,
+        time_limit=None,
+        table_size=1 << 18,
+        min_probability=1e-4,
+        evaluate=evaluate,
+    ):
+        """evaluate scores leaf boards, e.g. a trained ntuple.NTupleNetwork"""
+        self.depth = depth
+        self.time_limit = time_limit
+        self.table_size = table_size
+        self.min_probability = min_probability
+        self.evaluate = evaluate
+        # -- building the row table takes longer than a hint's time budget,
+        # -- so it is done here, in _init_worker for HintWorker searches
+        heuristic_table()
+
+        self.table = {}
+        self.nodes = 0
+        self.deadline = None
+
+    def search(self, board):
+        """
+        Find the best move for board.
+
+        With a time limit the search deepens one ply at a time and returns
+        the deepest result that finished in time, the first ply always runs.
+        """
+        start = time.perf_counter()
+        self.nodes = 0
+        self.deadline = None
+
+        best, depth = None, 0
+        first = self.depth if self.time_limit is None else 1
+        for d in range(first, self.depth + 1):
+            try:
+                best = self.best_move(board, d)
+                depth = d
+            except SearchTimeout:
+                break
+            if self.time_limit is not None:
+                self.deadline = start + self.time_limit
+
+        return SearchResult(
+            board, best, depth, self.nodes, time.perf_counter() - start
+        )
+
+    def best_move(self, board, depth):
+        best_move, best_value = None, None
+        for move in engine.MOVES:
+            moved, _ = engine.move(board, move)
+            if moved == board:
+                continue
+            value = self.chance_node(moved, depth - 1, 1.0)
+            if best_value is None or value > best_value:
+                best_move, best_value = move, value
+        return best_move
+
+    def max_node(self, board, depth, prob):
+        best = 0.0
+        for move in engine.MOVES:
+            moved, _ = engine.move(board, move)
+            if moved != board:
+                best = max(best, self.chance_node(moved, depth - 1, prob))
+        return best
+
+    def chance_node(self, board, depth, prob):
+        self.nodes += 1
+        if self.deadline and not self.nodes & 0x3FF:
+            if time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+
+        if depth <= 0 or prob < self.min_probability:
+            return self.evaluate(board)
+
+        key = canonical(board)
+        cached = self.table.get(key)
+        if cached and cached[0] >= depth:
+            return cached[1]
+
+        cells = engine.empty_cells(board)
+        chances = spawn_chances(board)
+        prob /= len(cells)
+
+        value = 0.0
+        for cell in cells:
+            for exponent, p in chances:
+                child = board | (exponent << (4 * cell))
+                value += p * self.max_node(child, depth, prob * p)
+        value /= len(cells)
+
+        if len(self.table) >= self.table_size:
+            self.table.clear()
+        self.table[key] = (depth, value)
+        return value
+
+
+# -- one solver per worker process, its table survives between requests
+_worker_solver = None
+
+
+def _init_worker(depth, time_limit, table_size):
+    global _worker_solver
+    _worker_solver = Solver(depth, time_limit, table_size)
+
+
+def _worker_search(board):
+    return _worker_solver.search(board)
+
+
+class HintWorker:
+    """Computes best moves in a worker process, poll for the results"""
+
+    def __init__(self, depth=3, time_limit=0.1, table_size=1 << 18):
+        self.pool = ProcessPoolExecutor(
+            max_workers=1,
+            initializer=_init_worker,
+            initargs=(depth, time_limit, table_size),
+        )
+        self.pending = None
+        self.wanted = None
+        self.result = None
+
+    def request(self, board):
+        """Ask for the best move of board, returns immediately"""
+        self.wanted = board
+        if self.result and self.result.board == board:
+            return
+        if self.pending is None:
+            self.pending = self.pool.submit(_worker_search, board)
+
+    def poll(self):
+        """Latest result for the requested board, None while searching"""
+        if self.pending and self.pending.done():
+            self.result = self.pending.result()
+            self.pending = None
+
+            # -- the board changed while searching, start over
+            if self.result.board != self.wanted:
+                self.pending = self.pool.submit(_worker_search, self.wanted)
+
+        if self.result and self.result.board == self.wanted:
+            return self.result
+        return None
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import dataset
+
+
+@pytest.fixture
+def records(tmp_path):
+    """Dataset of 50 records over chunks of 8, state is the record index"""
+    with dataset.TrajectoryWriter(str(tmp_path), chunk_size=8) as writer:
+        records = np.zeros(50, dtype=dataset.RECORD)
+        records["state"] = np.arange(50)
+        writer.append(records)
+    return dataset.TrajectoryDataset(str(tmp_path))
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        slice(None, None, -1),
+        slice(None, None, 3),
+        slice(None, None, -3),
+        slice(45, 5, -7),
+        slice(3, 40, 5),
+        slice(-2, None, -9),
+        slice(5, 45, -1),
+        slice(10, 10),
+    ],
+)
+def test_slices_match_python(records, key):
+    assert records[key]["state"].tolist() == list(range(50))[key]
+
+
+def test_resume_flags_cut_off_games(tmp_path):
+    path = str(tmp_path)
+    dataset.export(path, 100, games=4, seed=1, chunk_size=16)
+    dataset.export(path, 200, games=4, seed=1, chunk_size=16)
+    data = dataset.TrajectoryDataset(path)[:]
+
+    # -- every board's last record in each run ends its game one way or the other
+    for end in (100, 200):
+        tail = data[end - 4 : end]
+        assert (tail["done"] | tail["truncated"]).all()
+    assert not (data["done"] & data["truncated"]).any()
+    assert data["truncated"].sum() <= 8
@@ -4,15 +4,26 @@ import random
 import pygame as pg
 
 from pygame import gfxdraw
+from functools import lru_cache
 from dataclasses import dataclass
 
 SIZE = (480, 640)
 SIZE_H = tuple(map(lambda x: int(x/2), SIZE))
 TITLE = "Cancer Cell"
+BACKGROUND = (100, 100, 100)
 
 EVT_SHRINKED = pg.USEREVENT + 1
 SHRINKED = pg.event.Event(EVT_SHRINKED)
 
+# -- target radii are rounded to SPRITE_STEP pixels, so each size is
+# -- rasterised the first time it shows and drawn from its sprite after that
+SPRITE_STEP = 2
+# -- sprites hold how much of each pixel the shape covers, as a palette
+# -- index, 0 is transparent and COVERED takes the full colour
+COVERED = 255
+# -- color each sprite's palette holds
+tints = {}
+
 
 class Game:
 
@@ -49,7 +60,7 @@ class Game:
                     self.flick_item.event(ev)
 
             # --DRAW
-            self.screen.fill((100, 100, 100))
+            self.screen.fill(BACKGROUND)
             if show_game_over:
                 draw_game_over(self.screen)
             else:
@@ -84,8 +95,11 @@ class FlickItem:
         self.position = (int(px), int(py))
 
     def draw(self, surface):
-        gfxdraw.aacircle(surface, *self.position, self.size//2, self.color)
-        gfxdraw.filled_circle(surface, *self.position, self.size//2, self.color)
+        # -- drawn around (r, r) so one sprite serves every position
+        r = int(self.size//2)
+        px, py = self.position
+        sprite, _ = tinted_sprite((r, r, r, r), self.color)
+        surface.blit(sprite, (px - r, py - r))
 
     def event(self, ev):
         if ev.type == pg.KEYDOWN:
@@ -122,23 +136,14 @@ class FlickTargets:
         return self.colors
 
     def draw(self, surface):
-        WIDTH, HEIGHT = SIZE
-        SIZE_H_X, SIZE_H_Y = SIZE_H
-
-        ellipse_rects = [
-            # cx cy rx ry
-            [WIDTH//2, 0, WIDTH//2, self.size],          # Top
-            [0, HEIGHT//2, self.size, HEIGHT//2],        # Left
-            [WIDTH//2, HEIGHT, WIDTH//2, self.size],     # Bottom
-            [WIDTH, HEIGHT//2, self.size, HEIGHT//2],    # Right
-        ]
+        size = round(self.size / SPRITE_STEP) * SPRITE_STEP
 
-        for col, rect in zip(self.colors, ellipse_rects):
-            ellipse = tuple(map(int, rect))
+        sprites = []
+        for col, ellipse in zip(self.colors, target_ellipses(size)):
             if any(val < 0 for val in ellipse):
                 continue
-            gfxdraw.aaellipse(surface, *ellipse, col)
-            gfxdraw.filled_ellipse(surface, *ellipse, col)
+            sprites.append(tinted_sprite(ellipse, col))
+        surface.blits(sprites, doreturn=False)
 
     def update(self, delta_time):
         self.size += delta_time * self.shrink_speed
@@ -173,6 +178,59 @@ class FlickTargets:
             self.size += 20
 
 
+def target_ellipses(size):
+    """(cx, cy, rx, ry) of the top, left, bottom and right targets"""
+    WIDTH, HEIGHT = SIZE
+    return [
+        # cx cy rx ry
+        (WIDTH//2, 0, WIDTH//2, size),          # Top
+        (0, HEIGHT//2, size, HEIGHT//2),        # Left
+        (WIDTH//2, HEIGHT, WIDTH//2, size),     # Bottom
+        (WIDTH, HEIGHT//2, size, HEIGHT//2),    # Right
+    ]
+
+
+@lru_cache(maxsize=None)
+def ellipse_sprite(ellipse):
+    """On screen part of an anti-aliased ellipse and where to blit it"""
+    cx, cy, rx, ry = ellipse
+    bounds = pg.Rect(cx - rx, cy - ry, 2*rx + 1, 2*ry + 1)
+    # -- one pixel past the screen, so ellipses on the far edges never clip
+    # -- to nothing
+    bounds = bounds.clip(pg.Rect(0, 0, SIZE[0] + 1, SIZE[1] + 1))
+
+    # -- drawn white on black, the red channel is then the coverage
+    shape = pg.Surface(bounds.size)
+    x, y = cx - bounds.x, cy - bounds.y
+    white = (COVERED,) * 3
+    gfxdraw.aaellipse(shape, x, y, rx, ry, white)
+    gfxdraw.filled_ellipse(shape, x, y, rx, ry, white)
+
+    # -- anti-aliasing straight into 8 bits searches the palette per pixel
+    coverage = pg.image.tobytes(shape, "RGBX")[::4]
+    surface = pg.image.frombytes(coverage, bounds.size, "P")
+    surface.set_colorkey(0)
+    return surface, bounds.topleft
+
+
+def tinted_sprite(ellipse, color):
+    """ellipse_sprite in color, the palette only changes with the color"""
+    sprite, pos = ellipse_sprite(ellipse)
+    if tints.get(sprite) != color:
+        sprite.set_palette(coverage_palette(color))
+        tints[sprite] = color
+    return sprite, pos
+
+
+@lru_cache(maxsize=64)
+def coverage_palette(color):
+    """Palette that colours a sprite, edges blend into the background"""
+    return [
+        tuple(b + (c - b) * i // COVERED for b, c in zip(BACKGROUND, color))
+        for i in range(256)
+    ]
+
+
 def draw_game_over(surface):
     font_name = pg.font.match_font("arial")
 
@@ -0,0 +1,278 @@
+"""
+Analytic physics for Flappy Bird, a stand-in for the part of pymunk the
+game uses.
+
+Birds are circles falling under constant gravity, pipes and the ground
+are axis aligned boxes that never rotate. A step integrates every body in
+closed form, tests circles against boxes and pushes touching circles back
+out. Collision handlers get the same begin callback as in pymunk, once
+when a circle starts touching a box, so the game posts the same score and
+game over events on either backend. Circles never collide with each
+other.
+
+    import lite as pm
+"""
+import math
+
+# -- a contact lasts until the circle moves this far off the box, as in
+# -- pymunk's collision_slop, resting on the ground is one contact
+COLLISION_SLOP = 0.1
+
+
+class Vec2d(tuple):
+    """2D vector with the pymunk.Vec2d operations the game uses"""
+
+    def __new__(cls, x=0.0, y=0.0):
+        return tuple.__new__(cls, (x, y))
+
+    x = property(lambda self: self[0])
+    y = property(lambda self: self[1])
+
+    def __add__(self, other):
+        return Vec2d(self[0] + other[0], self[1] + other[1])
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return Vec2d(self[0] - other[0], self[1] - other[1])
+
+    def __rsub__(self, other):
+        return Vec2d(other[0] - self[0], other[1] - self[1])
+
+    def __mul__(self, k):
+        return Vec2d(self[0] * k, self[1] * k)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, k):
+        return Vec2d(self[0] / k, self[1] / k)
+
+    def __neg__(self):
+        return Vec2d(-self[0], -self[1])
+
+    @property
+    def length(self):
+        return math.hypot(self[0], self[1])
+
+    def interpolate_to(self, other, t):
+        return Vec2d(
+            self[0] + (other[0] - self[0]) * t, self[1] + (other[1] - self[1]) * t
+        )
+
+    def __repr__(self):
+        return "Vec2d({}, {})".format(self[0], self[1])
+
+
+class ShapeFilter:
+    """Shapes sharing a non zero group never collide"""
+
+    def __init__(self, group=0, categories=0xFFFFFFFF, mask=0xFFFFFFFF):
+        self.group = group
+        self.categories = categories
+        self.mask = mask
+
+
+class Body:
+    DYNAMIC, KINEMATIC, STATIC = range(3)
+
+    __slots__ = ("mass", "moment", "body_type", "x", "y", "vx", "vy")
+
+    def __init__(self, mass=0, moment=0, body_type=DYNAMIC):
+        self.mass = mass
+        self.moment = moment
+        self.body_type = body_type
+        # -- plain floats, the step loop never builds vectors
+        self.x = self.y = self.vx = self.vy = 0.0
+
+    @property
+    def position(self):
+        return Vec2d(self.x, self.y)
+
+    @position.setter
+    def position(self, value):
+        self.x, self.y = value
+
+    @property
+    def velocity(self):
+        return Vec2d(self.vx, self.vy)
+
+    @velocity.setter
+    def velocity(self, value):
+        self.vx, self.vy = value
+
+
+class Shape:
+    def __init__(self, body):
+        self.body = body
+        self.collision_type = 0
+        self.filter = ShapeFilter()
+
+
+class Circle(Shape):
+    def __init__(self, body, radius, offset=(0, 0)):
+        super().__init__(body)
+        self.radius = radius
+
+
+class Poly(Shape):
+    """Only the axis aligned boxes of create_box are supported"""
+
+    def __init__(self, body, half):
+        super().__init__(body)
+        self.hx, self.hy = half
+
+    @classmethod
+    def create_box(cls, body, size=(10, 10), radius=0):
+        return cls(body, (size[0] / 2, size[1] / 2))
+
+    def bounds(self):
+        body = self.body
+        return (
+            body.x - self.hx,
+            body.y - self.hy,
+            body.x + self.hx,
+            body.y + self.hy,
+        )
+
+
+class Arbiter:
+    def __init__(self, shapes):
+        self.shapes = shapes
+
+
+class CollisionHandler:
+    def __init__(self):
+        self.begin = None
+        self.data = {}
+
+
+class Space:
+    def __init__(self):
+        self.gravity = Vec2d()
+        self.static_body = Body(body_type=Body.STATIC)
+        self._bodies = []
+        self.circles = []
+        self.boxes = []
+        self.handlers = {}
+        # -- (circle, box) pairs touching after the last step, mapped to
+        # -- whether their begin handler let them collide
+        self.touching = {}
+
+    @property
+    def gravity(self):
+        return self._gravity
+
+    @gravity.setter
+    def gravity(self, value):
+        self._gravity = Vec2d(*value)
+
+    @property
+    def bodies(self):
+        return list(self._bodies)
+
+    @property
+    def shapes(self):
+        return self.circles + self.boxes
+
+    def add(self, *objs):
+        for obj in objs:
+            if isinstance(obj, Body):
+                self._bodies.append(obj)
+            elif isinstance(obj, Circle):
+                self.circles.append(obj)
+            else:
+                self.boxes.append(obj)
+
+    def remove(self, *objs):
+        for obj in objs:
+            if isinstance(obj, Body):
+                self._bodies.remove(obj)
+            elif isinstance(obj, Circle):
+                self.circles.remove(obj)
+            else:
+                self.boxes.remove(obj)
+            self.touching = {
+                pair: solid for pair, solid in self.touching.items() if obj not in pair
+            }
+
+    def add_collision_handler(self, a, b):
+        return self.handlers.setdefault((a, b), CollisionHandler())
+
+    def step(self, dt):
+        gx, gy = self._gravity
+        # -- exact for constant gravity over the step
+        ax, ay = 0.5 * gx * dt * dt, 0.5 * gy * dt * dt
+        for body in self._bodies:
+            kind = body.body_type
+            if kind == Body.DYNAMIC:
+                body.x += body.vx * dt + ax
+                body.y += body.vy * dt + ay
+                body.vx += gx * dt
+                body.vy += gy * dt
+            elif kind == Body.KINEMATIC:
+                body.x += body.vx * dt
+                body.y += body.vy * dt
+
+        bounds = [(box,) + box.bounds() for box in self.boxes]
+        previous, touching = self.touching, {}
+        for circle in self.circles:
+            body = circle.body
+            r = circle.radius + COLLISION_SLOP
+            group = circle.filter.group
+            for box, x0, y0, x1, y1 in bounds:
+                cx, cy = body.x, body.y
+                if cx + r <= x0 or cx - r >= x1 or cy + r <= y0 or cy - r >= y1:
+                    continue
+                if group and group == box.filter.group:
+                    continue
+
+                # -- new contacts need real overlap, old ones last within slop
+                pair = circle, box
+                solid = previous.get(pair)
+                reach = r if solid is not None else circle.radius
+                dx = min(max(cx, x0), x1) - cx
+                dy = min(max(cy, y0), y1) - cy
+                if dx * dx + dy * dy >= reach * reach:
+                    continue
+
+                if solid is None:
+                    solid = self.begin(circle, box)
+                touching[pair] = solid
+                if solid and body.body_type == Body.DYNAMIC:
+                    self.separate(circle, box)
+        self.touching = touching
+
+    def begin(self, circle, box):
+        """Run the begin handler of a new contact, False to ignore it"""
+        handler = self.handlers.get((circle.collision_type, box.collision_type))
+        if handler is None or handler.begin is None:
+            return True
+        return bool(handler.begin(Arbiter((circle, box)), self, handler.data))
+
+    @staticmethod
+    def separate(circle, box):
+        """Push the circle out of the box and stop it moving inwards"""
+        body, r = circle.body, circle.radius
+        cx, cy = body.x, body.y
+        x0, y0, x1, y1 = box.bounds()
+        qx, qy = min(max(cx, x0), x1), min(max(cy, y0), y1)
+
+        dist = math.hypot(cx - qx, cy - qy)
+        if dist > 1e-9:
+            nx, ny = (cx - qx) / dist, (cy - qy) / dist
+            depth = r - dist
+        else:
+            # -- centre inside the box, leave through the nearest face
+            depth, nx, ny = min(
+                (cx - x0 + r, -1.0, 0.0),
+                (x1 - cx + r, 1.0, 0.0),
+                (cy - y0 + r, 0.0, -1.0),
+                (y1 - cy + r, 0.0, 1.0),
+            )
+        body.x, body.y = cx + nx * depth, cy + ny * depth
+
+        # -- relative to the box, the circle may only move away
+        inwards = (body.vx - box.body.vx) * nx + (body.vy - box.body.vy) * ny
+        if inwards < 0:
+            body.vx -= inwards * nx
+            body.vy -= inwards * ny
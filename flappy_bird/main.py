@@ -0,0 +1,584 @@
+import sys
+import random
+import argparse
+import importlib
+import pygame as pg
+from functools import lru_cache
+from collections import deque
+
+# -- physics module, pymunk or its analytic stand-in lite.py, see use_physics
+pm = None
+PHYSICS = "pymunk"
+
+FPS = 60
+# -- render rates, 0 is uncapped, the game plays the same at any of them
+HIGH_REFRESH = 144, 240
+LOW_POWER_FPS = 30
+SIZE = 400, 500
+CAPTION = "Flappy Bird"
+BACKGROUND = (100, 100, 100)
+
+# -- simulation seconds per real second, tuned as 0.1 per frame at 60 FPS
+TIME_SCALE = 6.0
+# -- fixed physics step in simulation seconds per backend, lite integrates
+# -- exactly and only has to step finer than a pipe is wide
+PHYSICS_DT = {"pymunk": 0.01, "lite": 0.05}
+# -- most simulation seconds run in one frame, slower frames slow the game
+MAX_LAG = 0.3
+# -- pipe pairs built up front, and where the idle ones wait off screen
+POOL_SIZE = 4
+PARK_POS = (-1000, -1000)
+# -- seconds of play kept for rewinding, and simulation seconds between
+# -- snapshots whatever the frame rate
+REWIND_SECONDS = 3.0
+SNAPSHOT_DT = 0.1
+COLLISION_MAP = {"BirdType": 1, "BlockType": 2, "GroundType": 3, "PointType": 4}
+
+EVENT_MAP = {"ScoreEvent": pg.USEREVENT + 1, "GameOverEvent": pg.USEREVENT + 2}
+
+
+def use_physics(name):
+    """Select the physics backend, pymunk or lite"""
+    global pm
+    pm = importlib.import_module(name)
+    if name == "pymunk":
+        from pymunk import pygame_util as putils
+
+        putils.positive_y_is_up = False
+
+
+# -- library use gets a backend without calling use_physics, lite when
+# -- pymunk is not installed
+try:
+    use_physics(PHYSICS)
+except ImportError:
+    use_physics("lite")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=CAPTION)
+    parser.add_argument(
+        "--physics",
+        choices=("pymunk", "lite"),
+        default=PHYSICS,
+        help="lite replaces pymunk with closed form physics (lite.py)",
+    )
+    parser.add_argument(
+        "--rewind",
+        action="store_true",
+        help="dying rewinds the game by %g seconds instead of ending it"
+        % REWIND_SECONDS,
+    )
+    rates = parser.add_mutually_exclusive_group()
+    rates.add_argument(
+        "--fps",
+        type=int,
+        default=FPS,
+        help="frames per second, e.g. %s for high refresh screens, 0 for uncapped"
+        % " or ".join(map(str, HIGH_REFRESH)),
+    )
+    rates.add_argument(
+        "--low-power",
+        dest="fps",
+        action="store_const",
+        const=LOW_POWER_FPS,
+        help="render at %d frames per second" % LOW_POWER_FPS,
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    use_physics(args.physics)
+    step = PHYSICS_DT[args.physics]
+
+    pg.init()
+    pg.display.set_caption(CAPTION)
+    score = 0
+
+    screen = pg.display.set_mode(SIZE, 0, 32)
+    clock = pg.time.Clock()
+
+    space = pm.Space()
+    space.gravity = (0.0, 20.0)
+
+    bird = Bird(20, (150, 200), space)
+    blocks = Blocks(space=space)
+
+    gamestarted = False
+    gameover = False
+    accumulator = 0.0
+    history = deque(maxlen=int(REWIND_SECONDS * TIME_SCALE / SNAPSHOT_DT))
+    since_snapshot = 0.0
+
+    add_ground(space)
+    setup_collisions(space, blocks, bird)
+
+    while True:
+        dt = clock.tick(args.fps) / 1000.0
+
+        # -- Events, the ones queued after a rewind belong to the abandoned run
+        rewound = False
+        for event in pg.event.get():
+            QUIT_COND = [
+                event.type == pg.QUIT,
+                event.type == pg.KEYDOWN and event.key == pg.K_ESCAPE,
+            ]
+
+            if any(QUIT_COND):
+                pg.quit()
+                sys.exit()
+
+            if event.type == EVENT_MAP.get("ScoreEvent") and not rewound:
+                score += 1
+
+            if event.type == EVENT_MAP.get("GameOverEvent") and not rewound:
+                if args.rewind and history:
+                    score = restore(history[0], bird, blocks)
+                    history.clear()
+                    accumulator = since_snapshot = 0.0
+                    rewound = True
+                else:
+                    gameover = True
+
+            if not gamestarted:
+                if event.type == pg.KEYDOWN and event.key == pg.K_SPACE:
+                    gamestarted = True
+
+            if gameover:
+                if event.type == pg.KEYDOWN and event.key == pg.K_SPACE:
+                    bird.reset()
+                    blocks.reset()
+                    score = 0
+                    accumulator = since_snapshot = 0.0
+                    history.clear()
+                    gameover = False
+
+            bird.event(event)
+
+        # -- Update
+        # print(clock.get_fps())
+        if gamestarted and not gameover:
+            # -- taken between frames, once every score event was counted
+            if since_snapshot <= 0.0:
+                history.append(snapshot(bird, blocks, score))
+                since_snapshot += SNAPSHOT_DT
+
+            # -- physics, spawns and scoring advance by elapsed time in
+            # -- fixed steps, the frame rate never changes the game
+            accumulator = min(accumulator + dt * TIME_SCALE, MAX_LAG)
+            while accumulator >= step:
+                bird.save()
+                blocks.save()
+                space.step(step)
+                bird.update(step)
+                blocks.update(step, bird)
+                accumulator -= step
+                since_snapshot -= step
+
+        # -- Draw
+        if gameover:
+            screen.blit(game_over_screen(score), (0, 0))
+        elif gamestarted:
+            # -- draw between the last two physics states, in one batch
+            alpha = accumulator / step
+            screen.fill(BACKGROUND)
+            frame = [bird.blit(alpha)]
+            frame.extend(blocks.blits(alpha))
+            frame.append((score_layer(score), (0, 0)))
+            screen.blits(frame, doreturn=False)
+        else:
+            screen.blit(start_screen(), (0, 0))
+
+        # options = putils.DrawOptions(screen)
+        # space.debug_draw(options)
+
+        pg.display.flip()
+
+
+def snapshot(bird, blocks, score):
+    """State of the whole game, cheap enough to take every frame"""
+    return bird.snapshot(), blocks.snapshot(), score
+
+
+def restore(state, bird, blocks):
+    """Go back to a snapshot without rebuilding the space, returns the score"""
+    bstate, blstate, score = state
+    bird.restore(bstate)
+    blocks.restore(blstate)
+    return score
+
+
+def post_score():
+    score_event = pg.event.Event(EVENT_MAP.get("ScoreEvent"))
+    pg.event.post(score_event)
+
+
+def post_gameover():
+    over_event = pg.event.Event(EVENT_MAP.get("GameOverEvent"))
+    pg.event.post(over_event)
+
+
+@lru_cache(maxsize=None)
+def get_font(size, bold=False, italic=False):
+    font = pg.font.Font(pg.font.match_font("arial"), size)
+    font.set_bold(bold)
+    font.set_italic(italic)
+    return font
+
+
+def draw_text(surface, txt, font, center, color):
+    surf = font.render(txt, True, pg.Color(color) if isinstance(color, str) else color)
+    rect = surf.get_rect()
+    rect.center = center
+    surface.blit(surf, rect)
+
+
+# -- the layers below are drawn once and blitted every frame, lru_cache
+# -- keeps the last one so only a new score renders text again
+
+
+@lru_cache(maxsize=1)
+def start_screen():
+    surface = pg.Surface(SIZE).convert()
+    surface.fill(BACKGROUND)
+
+    # -- title
+    draw_text(surface, CAPTION, get_font(40, bold=True), (SIZE[0] // 2, 50), "yellow")
+
+    # -- instructions
+    center = (SIZE[0] // 2, SIZE[1] // 2)
+    draw_text(surface, "Space to Start", get_font(25), center, "white")
+    return surface
+
+
+@lru_cache(maxsize=1)
+def game_over_screen(score):
+    surface = pg.Surface(SIZE).convert()
+    surface.fill(BACKGROUND)
+
+    # -- Draw Game Over Text
+    font = get_font(40, bold=True)
+    draw_text(surface, "GAME OVER", font, (SIZE[0] // 2, 100), "red")
+
+    # -- Draw score text
+    font = get_font(20, bold=True)
+    draw_text(surface, "Your Score " + str(score), font, (SIZE[0] // 2, 200), "white")
+
+    # -- Draw instructions
+    font = get_font(12, bold=True, italic=True)
+    txt = "Press Escape to QUIT, Space to RESTART"
+    draw_text(surface, txt, font, (SIZE[0] // 2, SIZE[1] - 20), "white")
+    return surface
+
+
+@lru_cache(maxsize=1)
+def score_layer(score):
+    """Score box for the top left corner"""
+    surface = pg.Surface((70, 45), pg.SRCALPHA).convert_alpha()
+    options = [("Score", 12, (25, 12), "black"), (str(score), 15, (17, 30), "white")]
+
+    # -- header highlight
+    pg.draw.rect(surface, (80, 80, 80), [10, 20, 50, 20])
+
+    # -- options
+    for txt, fs, pos, fcol in options:
+        draw_text(surface, txt, get_font(fs, bold=True), pos, fcol)
+    return surface
+
+
+def add_ground(space):
+    w, h = SIZE[0], 20
+    shape = pm.Poly.create_box(space.static_body, size=(w, h))
+    shape.body.position = (w / 2, SIZE[1] + h / 2)
+    shape.collision_type = COLLISION_MAP.get("GroundType")
+    space.add(shape)
+
+
+def setup_collisions(space, blocks, bird):
+    def bird_ground_solve(arbiter, space, data):
+        bird.deactivate()
+        blocks.deactivate()
+        post_gameover()
+        return True
+
+    bghandler = space.add_collision_handler(
+        COLLISION_MAP.get("BirdType"), COLLISION_MAP.get("GroundType")
+    )
+    bghandler.begin = bird_ground_solve
+
+    def bird_block_solve(arbiter, space, data):
+        bird.deactivate()
+        blocks.deactivate()
+        post_gameover()
+        return True
+
+    bbhandler = space.add_collision_handler(
+        COLLISION_MAP.get("BirdType"), COLLISION_MAP.get("BlockType")
+    )
+    bbhandler.begin = bird_block_solve
+
+
+class Bird:
+    def __init__(self, size, pos, space):
+        self.pos = pos
+        self.size = size
+
+        self.body = pm.Body(1, 1)
+        self.body.position = pos
+
+        self.shape = pm.Circle(self.body, size / 2)
+        self.shape.collision_type = COLLISION_MAP.get("BirdType")
+        self.shape.filter = pm.ShapeFilter()
+        space.add(self.body, self.shape)
+
+        self.flap_strength = 50
+        self.prev = self.body.position
+        self.image = None
+
+    def flap(self):
+        vx, vy = self.body.velocity
+        self.body.velocity = (vx, -self.flap_strength)
+
+    def deactivate(self):
+        self.flap_strength = 0
+
+    def reset(self):
+        self.body.position = self.pos
+        self.flap_strength = 50
+        self.body.velocity = (0, 0)
+        self.save()
+
+    def save(self):
+        """Remember the position before a physics step"""
+        self.prev = self.body.position
+
+    def snapshot(self):
+        return self.body.position, self.body.velocity, self.flap_strength
+
+    def restore(self, state):
+        self.body.position, self.body.velocity, self.flap_strength = state
+        self.save()
+
+    def make_image(self):
+        r = int(self.shape.radius)
+        surf = pg.Surface((2 * r + 1, 2 * r + 1), pg.SRCALPHA).convert_alpha()
+        pg.draw.circle(surf, pg.Color("yellow"), (r, r), r)
+        pg.draw.rect(surf, pg.Color("black"), [r, r - (r / 4), r, r / 2])
+        return surf
+
+    def blit(self, alpha=1.0):
+        """(image, position) to blit, between the last two physics states"""
+        if self.image is None:
+            self.image = self.make_image()
+        r = int(self.shape.radius)
+        pos = self.prev.interpolate_to(self.body.position, alpha)
+        return self.image, (int(pos[0]) - r, int(pos[1]) - r)
+
+    def event(self, ev):
+        if ev.type == pg.KEYDOWN:
+            if ev.key == pg.K_SPACE:
+                self.flap()
+
+    def update(self, dt):
+        pass
+
+
+class Blocks:
+    def __init__(self, width=30, gap=100, space=None, rng=None):
+        self.width = width
+        self.gap = gap
+        self.speed = 20
+        self.space = space
+        # -- pipe heights, seed it for a repeatable course
+        self.rng = rng or random.Random()
+
+        self.goal = None
+        self.goal_index = 0
+        # -- every pipe pair lives in the space for good, on screen pairs
+        # -- sit in blocks oldest first and the rest wait in idle
+        self.blocks = deque()
+        self.idle = deque(self.make_block() for _ in range(POOL_SIZE))
+        # -- block positions before the last physics step, by top shape
+        self.prev = {}
+        # -- simulation seconds
+        self.spawn_time = 0.0
+        self.spawn_delay = 10.0
+        self.spawn()
+
+        # -- built on the first draw, headless games never need it
+        self.block_image = None
+        self.active = True
+
+    def make_image(self):
+        m = 6
+        w, h = self.width, SIZE[1] * 2
+        surf = pg.Surface((w + m, h + m)).convert_alpha()
+        surf.fill((0, 0, 0, 0))
+
+        # -- top block
+        top = int(h / 2) - int(self.gap / 2)
+        pg.draw.rect(surf, pg.Color("black"), [0, 0, w + m, top + m])
+        pg.draw.rect(surf, pg.Color("green"), [m / 2, m / 2, w, top])
+
+        # -- bottom block
+        bot = int(h / 2) + int(self.gap / 2)
+        pg.draw.rect(surf, pg.Color("black"), [0, bot, w + m, h + m])
+        pg.draw.rect(surf, pg.Color("green"), [m / 2, bot + m / 2, w, h])
+
+        return surf
+
+    def make_block(self):
+        """A parked pipe pair, [bottom shape, top shape]"""
+        w, h = self.width, SIZE[1] * 2
+
+        # Top Block
+        tbody = pm.Body(body_type=pm.Body.KINEMATIC)
+        tbody.position = PARK_POS
+
+        tshape = pm.Poly.create_box(tbody, size=(w, h))
+        tshape.collision_type = COLLISION_MAP.get("BlockType")
+        self.space.add(tbody, tshape)
+
+        # Bottom Block
+        bbody = pm.Body(body_type=pm.Body.KINEMATIC)
+        bbody.position = PARK_POS
+
+        bshape = pm.Poly.create_box(bbody, size=(w, h))
+        bshape.collision_type = COLLISION_MAP.get("BlockType")
+        self.space.add(bbody, bshape)
+
+        return [bshape, tshape]
+
+    def place(self, block, pos):
+        """Move a pipe pair to pos and set it sliding"""
+        h = SIZE[1] * 2
+        px, py = pos
+        bshape, tshape = block
+
+        tshape.body.position = (px, py - ((h / 2) + (self.gap / 2)))
+        bshape.body.position = (px, py + ((h / 2) + (self.gap / 2)))
+        for b in [bshape.body, tshape.body]:
+            b.velocity = (-self.speed, 0)
+
+        # -- never interpolate from where the pair was before
+        self.prev.pop(tshape, None)
+
+    def park(self, block):
+        for shape in block:
+            shape.body.position = PARK_POS
+            shape.body.velocity = (0, 0)
+        self.idle.append(block)
+
+    def make_goal(self):
+        mean_pos = lambda s: (s[0].body.position + s[1].body.position) / 2
+        pos = mean_pos(self.blocks[self.goal_index])
+
+        return pg.Rect(pos.x + self.width / 2, pos.y - self.gap / 2, 25, self.gap)
+
+    def deactivate(self):
+        self.active = False
+        for shape in [s for block in self.blocks for s in block]:
+            shape.body.velocity = (0, 0)
+
+    def reset(self):
+        while self.blocks:
+            self.park(self.blocks.popleft())
+
+        self.goal = None
+        self.goal_index = 0
+        self.spawn_time = 0.0
+        self.prev.clear()
+        self.spawn()
+        self.active = True
+
+    def snapshot(self):
+        """Pipe pairs with their gap centres, goal, spawn timer and the
+        random state the next pipe heights come from"""
+        pipes = tuple(
+            (block, (block[0].body.position + block[1].body.position) / 2)
+            for block in self.blocks
+        )
+        return pipes, self.goal_index, self.spawn_time, self.active, self.rng.getstate()
+
+    def restore(self, state):
+        """Put the pooled pairs back where a snapshot had them, O(pipes)"""
+        pipes, self.goal_index, self.spawn_time, active, rng_state = state
+        while self.blocks:
+            self.park(self.blocks.popleft())
+        for block, pos in pipes:
+            self.idle.remove(block)
+            self.place(block, pos)
+            self.blocks.append(block)
+
+        self.goal = None
+        self.rng.setstate(rng_state)
+        self.active = True
+        if not active:
+            self.deactivate()
+
+    def spawn(self):
+        rand_y = self.rng.randrange(self.gap, SIZE[1] - self.gap)
+        if not self.idle:
+            # -- a pool too small for the spawn rate reuses the oldest pair
+            self.park(self.blocks.popleft())
+            self.goal_index = max(0, self.goal_index - 1)
+        block = self.idle.popleft()
+        self.place(block, (500, rand_y))
+        self.blocks.append(block)
+
+    def save(self):
+        """Remember the block positions before a physics step"""
+        self.prev = {
+            tblock: (bblock.body.position + tblock.body.position) / 2
+            for bblock, tblock in self.blocks
+        }
+
+    def blits(self, alpha=1.0):
+        """(image, position) of every pipe pair, for Surface.blits"""
+        # if self.goal:
+        #     pg.draw.rect(surface, pg.Color("red"), self.goal, 2)
+        if self.block_image is None:
+            self.block_image = self.make_image()
+        img = self.block_image
+        w, h = img.get_size()
+
+        result = []
+        for bblock, tblock in self.blocks:
+            p = (bblock.body.position + tblock.body.position) / 2
+            p = self.prev.get(tblock, p).interpolate_to(p, alpha)
+            result.append((img, (int(p[0]) - w // 2, int(p[1]) - h // 2)))
+        return result
+
+    def update(self, dt, bird):
+        if not self.active:
+            return
+
+        self.advance(dt)
+        if self.reached(bird.body.position):
+            post_score()
+
+    def advance(self, dt):
+        """Spawn and recycle pipe pairs after dt simulation seconds"""
+        # recycle blocks out of view, the oldest leaves first
+        if self.blocks and self.blocks[0][1].body.position.x < 0:
+            self.park(self.blocks.popleft())
+            self.goal_index -= 1
+
+        # Spawn block
+        self.spawn_time += dt
+        if self.spawn_time >= self.spawn_delay:
+            self.spawn()
+            self.spawn_time -= self.spawn_delay
+
+    def reached(self, *positions):
+        """True when any position is in the goal, the goal then moves on"""
+        self.goal = self.make_goal()
+        if any(self.goal.collidepoint(pos) for pos in positions):
+            self.goal_index += 1
+            return True
+        return False
+
+
+if __name__ == "__main__":
+    main()
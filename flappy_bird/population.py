@@ -0,0 +1,200 @@
+"""
+Headless Flappy Bird for whole populations of agents.
+
+Every bird of a generation flies through the same pipes in one physics
+space. The birds share a ShapeFilter group, so they pass through each
+other and only hit pipes and the ground. A bird that does is taken out of
+the space on its own, the others fly on. Each frame every living bird's
+policy is called with what it sees and returns whether to flap.
+
+    def policy(obs):
+        y, vy, dx, gap_y = obs
+        return y > gap_y
+
+    population = Population(policies)
+    results = population.run()   # [(fitness, distance, score), ...]
+
+Run this file to evolve simple linear policies and print each generation.
+"""
+import time
+import random
+import argparse
+
+import main
+from main import (
+    FPS,
+    SIZE,
+    TIME_SCALE,
+    PHYSICS,
+    PHYSICS_DT,
+    COLLISION_MAP,
+    Bird,
+    Blocks,
+    add_ground,
+    use_physics,
+)
+
+# -- simulation seconds per frame, policies decide once a frame as players do
+FRAME = TIME_SCALE / FPS
+# -- a generation ends when every bird died or after this many seconds
+MAX_TIME = 300.0
+# -- fitness of a pipe passed, about the distance between two pipes
+PIPE_REWARD = 200.0
+# -- shapes in one non zero group never collide with each other
+BIRD_GROUP = 1
+
+
+class Population:
+    """Birds of one generation in a shared world, one policy each"""
+
+    def __init__(self, policies, seed=None):
+        self.policies = list(policies)
+        space = self.space = main.pm.Space()
+        space.gravity = (0.0, 20.0)
+
+        self.birds = []
+        self.by_shape = {}
+        for i in range(len(self.policies)):
+            bird = Bird(20, (150, 200), space)
+            bird.shape.filter = main.pm.ShapeFilter(group=BIRD_GROUP)
+            self.birds.append(bird)
+            self.by_shape[bird.shape] = i
+        # -- a seed gives every population with it the same course
+        self.blocks = Blocks(space=space, rng=random.Random(seed))
+        add_ground(space)
+        self.setup_collisions()
+
+        self.alive = list(range(len(self.birds)))
+        self.dying = []
+        self.time = 0.0
+        self.decisions = 0
+        self.lifetime = [None] * len(self.birds)
+        self.scores = [0] * len(self.birds)
+
+    def setup_collisions(self):
+        def bird_crash(arbiter, space, data):
+            self.dying.append(self.by_shape[arbiter.shapes[0]])
+            # -- the bird is removed after the step, nothing to push back
+            return False
+
+        for kind in ("GroundType", "BlockType"):
+            handler = self.space.add_collision_handler(
+                COLLISION_MAP.get("BirdType"), COLLISION_MAP.get(kind)
+            )
+            handler.begin = bird_crash
+
+    def observe(self, bird):
+        """(y, vy, dx, gap_y), dx and gap_y of the next pipe gap"""
+        bshape, tshape = self.blocks.blocks[self.blocks.goal_index]
+        gap = (bshape.body.position + tshape.body.position) / 2
+        pos = bird.body.position
+        return pos.y, bird.body.velocity.y, gap.x - pos.x, gap.y
+
+    def step(self, dt):
+        """One frame, every living bird decides then physics runs dt"""
+        self.decisions += len(self.alive)
+        for i in self.alive:
+            bird = self.birds[i]
+            if self.policies[i](self.observe(bird)):
+                bird.flap()
+
+        substeps = max(1, round(FRAME / dt))
+        for _ in range(substeps):
+            self.space.step(FRAME / substeps)
+            if self.dying:
+                self.remove_dead()
+        self.time += FRAME
+
+        self.blocks.advance(FRAME)
+        positions = [self.birds[i].body.position for i in self.alive]
+        if self.alive and self.blocks.reached(*positions):
+            for i in self.alive:
+                self.scores[i] += 1
+
+    def remove_dead(self):
+        for i in set(self.dying):
+            bird = self.birds[i]
+            self.space.remove(bird.body, bird.shape)
+            self.lifetime[i] = self.time
+            self.alive.remove(i)
+        self.dying = []
+
+    def run(self, max_time=MAX_TIME, dt=None):
+        """Fly until every bird died, returns (fitness, distance, score)"""
+        dt = dt or PHYSICS_DT[main.pm.__name__]
+        while self.alive and self.time < max_time:
+            self.step(dt)
+        return self.results()
+
+    def results(self):
+        speed = self.blocks.speed
+        results = []
+        for lifetime, score in zip(self.lifetime, self.scores):
+            distance = speed * (self.time if lifetime is None else lifetime)
+            results.append((distance + PIPE_REWARD * score, distance, score))
+        return results
+
+
+class LinearPolicy:
+    """Flaps when a weighted sum of the observation is positive"""
+
+    def __init__(self, weights):
+        self.weights = weights
+
+    def __call__(self, obs):
+        y, vy, dx, gap_y = obs
+        w = self.weights
+        value = w[0] * (y - gap_y) / SIZE[1] + w[1] * vy / 50 + w[2] * dx / SIZE[0]
+        return value + w[3] > 0
+
+    def mutate(self, rng, sigma):
+        return LinearPolicy([w + rng.gauss(0, sigma) for w in self.weights])
+
+
+def evolve(birds, generations, seed=0, keep=0.1, sigma=0.3, max_time=MAX_TIME):
+    """Random search over linear policies, prints every generation"""
+    rng = random.Random(seed)
+    policies = [LinearPolicy([rng.gauss(0, 1) for _ in range(4)]) for _ in range(birds)]
+    for generation in range(generations):
+        start = time.perf_counter()
+        population = Population(policies, seed=seed + generation)
+        results = population.run(max_time)
+        elapsed = time.perf_counter() - start
+
+        fitness = [r[0] for r in results]
+        best = max(range(birds), key=fitness.__getitem__)
+        print(
+            "gen {:3d}  best {:8.1f} ({:3d} pipes)  mean {:8.1f}  "
+            "{:6.1f} sim s  {:8.0f} decisions/s".format(
+                generation,
+                fitness[best],
+                results[best][2],
+                sum(fitness) / birds,
+                population.time,
+                population.decisions / elapsed,
+            ),
+            flush=True,
+        )
+
+        ranked = sorted(range(birds), key=fitness.__getitem__, reverse=True)
+        parents = [policies[i] for i in ranked[: max(1, int(birds * keep))]]
+        policies = parents + [
+            rng.choice(parents).mutate(rng, sigma) for _ in range(birds - len(parents))
+        ]
+    return policies
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Flappy Bird population")
+    parser.add_argument("--physics", choices=("pymunk", "lite"), default=PHYSICS)
+    parser.add_argument("--birds", type=int, default=1000)
+    parser.add_argument("--generations", type=int, default=10)
+    parser.add_argument("--max-time", type=float, default=MAX_TIME)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    use_physics(args.physics)
+    evolve(args.birds, args.generations, args.seed, max_time=args.max_time)
@@ -0,0 +1,355 @@
+"""
+Headless multiplayer Snake server.
+
+Matches follow the rules of main.py, every snake shares the occupancy grid
+and the food of its match so running into any body, or head on into
+another snake, is a collision. A single asyncio loop steps every match at
+TICK_RATE and sends each match one delta of the cells it changed.
+
+Frames are a little endian u16 length followed by the payload, the first
+payload byte is the message kind:
+
+    TURN      client  u8 direction, an index into main.directions
+    WELCOME   server  u8 player, u8 cols, u8 rows
+    SNAPSHOT  server  every non empty cell, the client starts from scratch
+    DELTA     server  the cells changed by one tick
+
+SNAPSHOT and DELTA share the TICK layout: u32 tick, u16 cell count, u8
+player count, the cells as (x, y, value) bytes and a u16 score per
+player. Cell values are EMPTY, FOOD or PLAYER + player.
+
+    python arena.py [address] [players]
+
+Addresses are host:port for TCP, anything else is a Unix socket path.
+"""
+import sys
+import time
+import struct
+import asyncio
+
+from main import (
+    GS,
+    HEADER_ROWS,
+    TICK_RATE,
+    FreeCells,
+    Snake,
+    Target,
+    directions,
+)
+
+ARENA_ADDRESS = "127.0.0.1:7777"
+ARENA_GRID = 20, 20
+ARENA_PLAYERS = 4
+SEGMENTS = 5
+# -- seconds a lone player waits in the lobby before playing short handed
+LOBBY_WAIT = 1.0
+# -- clients further behind than this many bytes are dropped
+MAX_BUFFER = 1 << 16
+# -- seconds between server statistics
+STATS_EVERY = 5.0
+
+# -- message kinds
+TURN, WELCOME, SNAPSHOT, DELTA = range(4)
+# -- cell values
+EMPTY, FOOD, PLAYER = 0, 1, 2
+
+FRAME = struct.Struct("<H")
+WELCOME_BODY = struct.Struct("<BBB")
+TICK_BODY = struct.Struct("<IHB")
+
+
+def frame(kind, body):
+    return FRAME.pack(len(body) + 1) + bytes((kind,)) + body
+
+
+async def read_frame(reader):
+    """(kind, body) of the next frame, IncompleteReadError once closed"""
+    (size,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    payload = await reader.readexactly(size)
+    return payload[0], payload[1:]
+
+
+def encode_tick(kind, tick, cells, scores):
+    """cells is a bytearray of (x, y, value) triples"""
+    header = TICK_BODY.pack(tick, len(cells) // 3, len(scores))
+    return frame(kind, header + cells + struct.pack("<%dH" % len(scores), *scores))
+
+
+def decode_tick(body):
+    """(tick, cells, scores) of a SNAPSHOT or DELTA body"""
+    tick, count, players = TICK_BODY.unpack_from(body)
+    start = TICK_BODY.size
+    cells = body[start : start + 3 * count]
+    scores = struct.unpack_from("<%dH" % players, body, start + 3 * count)
+    return tick, cells, scores
+
+
+def parse_address(address):
+    """('tcp', host, port) or ('unix', path)"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return "tcp", host or "127.0.0.1", int(port)
+    return "unix", address
+
+
+class ArenaSnake(Snake):
+    """Snake on the shared occupancy grid of a Match"""
+
+    def __init__(self, match, pos, player):
+        self.match = match
+        self.player = player
+        self.alive = True
+        super().__init__(pos, SEGMENTS, None, match.grid)
+
+    def make_board(self):
+        return self.match.occupied, self.match.free
+
+    def remove(self):
+        """Take the body off the grid after a collision"""
+        self.alive = False
+        for cell in self.snake:
+            self.occupy(cell, -1)
+
+
+class Match:
+    """Snakes of several players on one board, stepped by Arena"""
+
+    def __init__(self, players, grid=ARENA_GRID):
+        self.players = players
+        self.grid = self.cols, self.rows = grid
+        self.connections = []
+        self.tick = 0
+        self.reset()
+
+    def reset(self):
+        cols, rows = self.grid
+        self.occupied = bytearray(cols * rows)
+        self.owner = bytearray(cols * rows)
+        # -- same cells as Snake.make_board, food stays off the left column
+        self.free = FreeCells(
+            (x, y) for x in range(1, cols) for y in range(HEADER_ROWS, rows)
+        )
+
+        # -- heads side by side in the middle row, bodies trailing down
+        y = (rows + HEADER_ROWS) // 2 - SEGMENTS // 2
+        self.snakes = []
+        for player in range(self.players):
+            x = (player + 1) * cols // (self.players + 1)
+            snake = ArenaSnake(self, (x * GS, y * GS), player)
+            for cx, cy in snake.snake:
+                self.owner[cy * cols + cx] = PLAYER + player
+            snake.changed.clear()
+            self.snakes.append(snake)
+
+        self.target = Target((0, 0), (GS, GS), None)
+        self.target.spawn(self.snakes[0])
+        self.scores = [0] * self.players
+
+    @property
+    def food(self):
+        return self.target.pos[0] // GS, self.target.pos[1] // GS
+
+    def turn(self, player, direction):
+        snake = self.snakes[player]
+        if snake.alive and 0 <= direction < len(directions):
+            snake.turn(directions[direction])
+
+    def step(self):
+        """Advance one tick, returns the frame to broadcast"""
+        self.tick += 1
+        food = self.food
+        alive = [s for s in self.snakes if s.alive]
+
+        # -- every head moves before any tail, so a tail leaving this tick
+        # -- frees its cell for whoever moves in, as in the single player game
+        for snake in alive:
+            snake.update(0)
+        for snake in alive:
+            if snake.collide_target(self.target):
+                self.scores[snake.player] += 1
+        dead = [s for s in alive if s.collide_walls() or s.collide_self()]
+        for snake in dead:
+            snake.remove()
+
+        if len(dead) == len(alive) or not self.free:
+            self.reset()
+            return self.snapshot()
+
+        cols = self.cols
+        for snake in alive:
+            if snake.alive:
+                x, y = snake.head
+                self.owner[y * cols + x] = PLAYER + snake.player
+
+        changed = set()
+        for snake in self.snakes:
+            changed |= snake.changed
+            snake.changed.clear()
+        if self.food != food:
+            changed.add(self.food)
+
+        cells = bytearray()
+        for x, y in changed:
+            cells += bytes((x, y, self.value(x, y)))
+        return encode_tick(DELTA, self.tick, cells, self.scores)
+
+    def value(self, x, y):
+        idx = y * self.cols + x
+        if self.occupied[idx]:
+            return self.owner[idx]
+        return FOOD if (x, y) == self.food else EMPTY
+
+    def snapshot(self):
+        cells = bytearray()
+        for idx, count in enumerate(self.occupied):
+            if count:
+                cells += bytes((idx % self.cols, idx // self.cols, self.owner[idx]))
+        cells += bytes((*self.food, FOOD))
+        return encode_tick(SNAPSHOT, self.tick, cells, self.scores)
+
+
+class Connection:
+    """A client socket, the match it plays in and its player index"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.match = None
+        self.player = None
+        self.joined = time.perf_counter()
+
+    def send(self, data):
+        if self.writer.is_closing():
+            return
+        # -- a client that can't keep up would grow the buffer forever
+        if self.writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            self.writer.close()
+            return
+        self.writer.write(data)
+
+
+class Arena:
+    """Lobby, matches and the tick loop of the server"""
+
+    def __init__(self, players=ARENA_PLAYERS, rate=TICK_RATE):
+        self.players = players
+        self.interval = 1.0 / rate
+        self.lobby = []
+        self.matches = set()
+
+        # -- statistics since the last report
+        self.ticks = 0
+        self.busy = 0.0
+        self.jitter = []
+
+    async def handle(self, reader, writer):
+        conn = Connection(writer)
+        self.lobby.append(conn)
+        try:
+            while True:
+                kind, body = await read_frame(reader)
+                if kind == TURN and conn.match and body:
+                    conn.match.turn(conn.player, body[0])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.leave(conn)
+            writer.close()
+
+    def leave(self, conn):
+        if conn in self.lobby:
+            self.lobby.remove(conn)
+        match = conn.match
+        if match:
+            match.connections.remove(conn)
+            if not match.connections:
+                self.matches.discard(match)
+
+    def start(self, conns):
+        match = Match(len(conns))
+        match.connections = conns
+        snapshot = match.snapshot()
+        for player, conn in enumerate(conns):
+            conn.match, conn.player = match, player
+            body = WELCOME_BODY.pack(player, match.cols, match.rows)
+            conn.send(frame(WELCOME, body) + snapshot)
+        self.matches.add(match)
+
+    def fill_matches(self):
+        while len(self.lobby) >= self.players:
+            conns, self.lobby = self.lobby[: self.players], self.lobby[self.players :]
+            self.start(conns)
+        if self.lobby and time.perf_counter() - self.lobby[0].joined > LOBBY_WAIT:
+            conns, self.lobby = self.lobby, []
+            self.start(conns)
+
+    def step(self):
+        for match in self.matches:
+            data = match.step()
+            for conn in match.connections:
+                conn.send(data)
+        # -- new matches get their snapshot now and the first delta next tick
+        self.fill_matches()
+
+    async def run(self):
+        """Step every match at a fixed rate, deadlines never drift"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.interval
+        report = time.perf_counter() + STATS_EVERY
+        while True:
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            self.jitter.append(loop.time() - deadline)
+
+            start = time.perf_counter()
+            self.step()
+            self.busy += time.perf_counter() - start
+            self.ticks += 1
+
+            # -- a tick that overran skips ahead instead of bursting
+            deadline += self.interval
+            if loop.time() > deadline:
+                deadline = loop.time() + self.interval
+
+            if time.perf_counter() > report:
+                report += STATS_EVERY
+                self.report()
+
+    def report(self):
+        jitter = sorted(self.jitter)
+        p99 = jitter[int(len(jitter) * 0.99)] if jitter else 0.0
+        print(
+            "{:6d} matches {:6d} players  step {:6.2f} ms  "
+            "load {:5.1%}  jitter mean {:5.2f} ms p99 {:5.2f} ms".format(
+                len(self.matches),
+                sum(len(m.connections) for m in self.matches),
+                1000 * self.busy / max(1, self.ticks),
+                self.busy / (self.ticks * self.interval) if self.ticks else 0.0,
+                1000 * sum(jitter) / max(1, len(jitter)),
+                1000 * p99,
+            ),
+            flush=True,
+        )
+        self.ticks, self.busy, self.jitter = 0, 0.0, []
+
+
+async def serve(address=ARENA_ADDRESS, players=ARENA_PLAYERS):
+    arena = Arena(players)
+    kind, *where = parse_address(address)
+    if kind == "tcp":
+        server = await asyncio.start_server(arena.handle, *where)
+    else:
+        server = await asyncio.start_unix_server(arena.handle, *where)
+    print("Snake arena on", address, flush=True)
+    async with server:
+        await arena.run()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(
+            serve(
+                sys.argv[1] if len(sys.argv) > 1 else ARENA_ADDRESS,
+                int(sys.argv[2]) if len(sys.argv) > 2 else ARENA_PLAYERS,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,256 @@
+"""
+Autopilot for Snake.
+
+Strategies look at the snake's occupancy grid and return the next direction,
+Autopilot turns it into the key event Snake.event expects.
+
+    PathStrategy   A* to the food, the path is cached and only replanned
+                   when the food moves or the next step got blocked.
+    CycleStrategy  follows a Hamiltonian cycle over the playfield, taking
+                   shortcuts towards the food that never pass the tail, so
+                   it always completes the board.
+
+Run this file to benchmark the strategies on large grids.
+"""
+import sys
+import time
+import heapq
+import random
+from collections import deque
+
+import pygame as pg
+
+from main import GS, HEADER_ROWS, Snake, Target, keys, directions
+
+
+def cell_of(target):
+    return target.pos[0] // GS, target.pos[1] // GS
+
+
+def neighbours(snake, cell):
+    x, y = cell
+    for dx, dy in directions:
+        n = x + dx, y + dy
+        if snake.in_grid(n):
+            yield n
+
+
+def is_free(snake, cell):
+    """Free now or by the time the head gets there, the tail moves on"""
+    x, y = cell
+    return not snake.occupied[y * snake.cols + x] or cell == snake.snake[-1]
+
+
+def flood_size(snake, start, limit):
+    """Free cells reachable from start, counting stops at limit"""
+    seen = {start}
+    queue = deque([start])
+    while queue and len(seen) < limit:
+        for n in neighbours(snake, queue.popleft()):
+            if n not in seen and is_free(snake, n):
+                seen.add(n)
+                queue.append(n)
+    return len(seen)
+
+
+def safest_direction(snake):
+    """Step into the largest free region, used when no plan is left"""
+    hx, hy = snake.head
+    best, best_size = snake.direction, -1
+    limit = len(snake.snake) * 2 + 1
+    for dx, dy in directions:
+        n = hx + dx, hy + dy
+        if snake.in_grid(n) and is_free(snake, n):
+            size = flood_size(snake, n, limit)
+            if size > best_size:
+                best, best_size = (dx, dy), size
+    return best
+
+
+def step_direction(src, dst):
+    return dst[0] - src[0], dst[1] - src[1]
+
+
+class PathStrategy:
+    """A* to the food with a cached path"""
+
+    def __init__(self):
+        self.path = deque()
+        self.goal = None
+        self.plans = 0
+
+    def plan(self, snake, goal):
+        """Shortest free path from the head to goal, without the head"""
+        self.plans += 1
+        start = snake.head
+        gx, gy = goal
+
+        def h(c):
+            return abs(c[0] - gx) + abs(c[1] - gy)
+
+        came = {start: None}
+        cost = {start: 0}
+        # -- ties go to the deepest node, open grids then expand one line
+        heap = [(h(start), 0, start)]
+        while heap:
+            _, g, cell = heapq.heappop(heap)
+            g = -g
+            if cell == goal:
+                path = deque()
+                while cell != start:
+                    path.appendleft(cell)
+                    cell = came[cell]
+                return path
+            if g > cost[cell]:
+                continue
+            for n in neighbours(snake, cell):
+                if (n not in cost or g + 1 < cost[n]) and is_free(snake, n):
+                    cost[n] = g + 1
+                    came[n] = cell
+                    heapq.heappush(heap, (g + 1 + h(n), -g - 1, n))
+        return deque()
+
+    def next_direction(self, snake, target):
+        goal = cell_of(target)
+        head = snake.head
+
+        # -- the body only ever covers cells the head went through, a plan
+        # -- stays valid until the food moves or its next step got blocked
+        valid = self.goal == goal and self.path
+        if valid:
+            nxt = self.path[0]
+            adjacent = abs(nxt[0] - head[0]) + abs(nxt[1] - head[1]) == 1
+            valid = adjacent and is_free(snake, nxt)
+        if not valid:
+            self.goal = goal
+            self.path = self.plan(snake, goal)
+
+        if not self.path:
+            return safest_direction(snake)
+        return step_direction(head, self.path.popleft())
+
+
+class CycleStrategy:
+    """Hamiltonian cycle with shortcuts that never overtake the tail"""
+
+    # -- no shortcuts once the snake covers this share of the board
+    SHORTCUT_LIMIT = 0.5
+    # -- cells kept between the head and the tail when cutting the cycle
+    TAIL_MARGIN = 4
+
+    def __init__(self, snake):
+        self.order = self.make_cycle(snake.cols, snake.rows - snake.top, snake.top)
+        self.cycle = [None] * len(self.order)
+        for cell, index in self.order.items():
+            self.cycle[index] = cell
+
+    @staticmethod
+    def make_cycle(width, height, top=HEADER_ROWS):
+        """Cycle index of every playfield cell"""
+        transpose = height % 2
+        if transpose:
+            width, height = height, width
+        if height % 2 or width < 2:
+            raise ValueError("A Hamiltonian cycle needs an even side")
+
+        # -- rows zig-zag over columns 1.., column 0 leads back to the start
+        cells = []
+        for y in range(height):
+            xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+            cells.extend((x, y) for x in xs)
+        cells.extend((0, y) for y in range(height - 1, -1, -1))
+
+        if transpose:
+            cells = [(y, x) for x, y in cells]
+        return {(x, y + top): i for i, (x, y) in enumerate(cells)}
+
+    def distance(self, a, b):
+        """Steps from a to b along the cycle"""
+        return (self.order[b] - self.order[a]) % len(self.order)
+
+    def next_direction(self, snake, target):
+        head, tail = snake.head, snake.snake[-1]
+        nxt = self.cycle[(self.order[head] + 1) % len(self.cycle)]
+        best = nxt if is_free(snake, nxt) else None
+
+        if len(snake.snake) < len(self.cycle) * self.SHORTCUT_LIMIT:
+            food = cell_of(target)
+            tail_dist = self.distance(head, tail) - self.TAIL_MARGIN
+            food_dist = self.distance(head, food) if food in self.order else 0
+            best_dist = 1 if best else 0
+            for n in neighbours(snake, head):
+                d = self.distance(head, n)
+                if best_dist < d <= food_dist and d < tail_dist and is_free(snake, n):
+                    best, best_dist = n, d
+
+        if best is None:
+            return safest_direction(snake)
+        return step_direction(head, best)
+
+
+STRATEGIES = {"path": PathStrategy, "cycle": CycleStrategy}
+
+
+class Autopilot:
+    """Steers a snake with a strategy through Snake.event"""
+
+    def __init__(self, snake, strategy="path"):
+        factory = STRATEGIES[strategy]
+        self.strategy = factory(snake) if factory is CycleStrategy else factory()
+        self.decisions = 0
+        self.elapsed = 0.0
+
+    def steer(self, snake, target):
+        start = time.perf_counter()
+        direction = self.strategy.next_direction(snake, target)
+        self.elapsed += time.perf_counter() - start
+        self.decisions += 1
+
+        # -- the decision replaces whatever turns were queued
+        snake.turns.clear()
+        key = keys[directions.index(direction)]
+        snake.event(pg.event.Event(pg.KEYDOWN, key=key))
+
+    @property
+    def decisions_per_second(self):
+        return self.decisions / self.elapsed if self.elapsed else 0.0
+
+
+def play(strategy, grid, max_ticks):
+    """One headless game, returns (score, autopilot)"""
+    cols, rows = grid
+    snake = Snake(((cols // 2) * GS, (rows // 2) * GS), 5, None, grid)
+    target = Target((0, 0), (GS, GS), None)
+    target.spawn(snake)
+    pilot = Autopilot(snake, strategy)
+
+    score = 0
+    for _ in range(max_ticks):
+        pilot.steer(snake, target)
+        snake.update(0)
+        if snake.collide_target(target):
+            score += 1
+        if snake.collide_walls() or snake.collide_self() or snake.board_full:
+            break
+    return score, pilot
+
+
+def benchmark(grids=((20, 20), (40, 40), (64, 64)), games=5, max_ticks=20000):
+    for grid in grids:
+        for name in STRATEGIES:
+            scores, decisions, elapsed = [], 0, 0.0
+            for _ in range(games):
+                score, pilot = play(name, grid, max_ticks)
+                scores.append(score)
+                decisions += pilot.decisions
+                elapsed += pilot.elapsed
+            print(
+                "{:>7}  {:>5}x{:<5} mean score {:8.1f}  {:10.0f} decisions/s".format(
+                    name, *grid, sum(scores) / games, decisions / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    random.seed(0)
+    benchmark(games=int(sys.argv[1]) if len(sys.argv) > 1 else 5)
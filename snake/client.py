@@ -0,0 +1,254 @@
+"""
+Clients of the Snake arena in arena.py.
+
+    python client.py play [address]                  thin client, keys steer
+    python client.py load [address] [bots] [seconds] load generator
+
+The thin client only mirrors the cells the server sends and draws them
+with main.Renderer. The load generator connects simulated bots that steer
+towards the food and reports ticks received and tick jitter as seen by
+the clients.
+"""
+import sys
+import time
+import random
+import asyncio
+
+import pygame as pg
+
+from main import (
+    FPS,
+    GS,
+    SIZE,
+    CAPTION,
+    BACKGROUND,
+    TICK_RATE,
+    Renderer,
+    Target,
+    keys,
+    opt_keys,
+    directions,
+)
+from arena import (
+    ARENA_ADDRESS,
+    TURN,
+    WELCOME,
+    SNAPSHOT,
+    DELTA,
+    EMPTY,
+    FOOD,
+    PLAYER,
+    WELCOME_BODY,
+    frame,
+    read_frame,
+    decode_tick,
+    parse_address,
+)
+
+# -- own snake first, then the other players
+COLORS = [(255, 0, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255), (0, 255, 255)]
+
+
+async def connect(address):
+    kind, *where = parse_address(address)
+    if kind == "tcp":
+        return await asyncio.open_connection(*where)
+    return await asyncio.open_unix_connection(*where)
+
+
+class Board:
+    """Client copy of a match, drawn by main.Renderer like a Snake"""
+
+    def __init__(self):
+        self.player = None
+        self.cols = self.rows = 0
+        self.cells = bytearray()
+        self.changed = set()
+        self.heads = {}
+        self.scores = ()
+        self.tick = 0
+        self.target = Target((0, 0), (GS, GS), pg.Color("green"))
+
+    @property
+    def score(self):
+        return self.scores[self.player] if self.player < len(self.scores) else 0
+
+    @property
+    def food(self):
+        return self.target.pos[0] // GS, self.target.pos[1] // GS
+
+    def apply(self, kind, body):
+        """Update from a server message"""
+        if kind == WELCOME:
+            self.player, self.cols, self.rows = WELCOME_BODY.unpack(body)
+            self.cells = bytearray(self.cols * self.rows)
+            return
+
+        self.tick, cells, self.scores = decode_tick(body)
+        if kind == SNAPSHOT:
+            self.heads = {}
+            for idx, value in enumerate(self.cells):
+                if value:
+                    self.set((idx % self.cols, idx // self.cols), EMPTY)
+
+        for i in range(0, len(cells), 3):
+            x, y, value = cells[i : i + 3]
+            if value == FOOD:
+                # -- the old food cell is repainted as whatever is there now
+                self.changed.add(self.food)
+                self.target.pos = x * GS, y * GS
+                value = EMPTY
+            # -- a delta only ever adds heads to the board
+            elif value != EMPTY and kind == DELTA:
+                self.heads[value - PLAYER] = x, y
+            self.set((x, y), value)
+
+    def set(self, cell, value):
+        x, y = cell
+        if self.cells[y * self.cols + x] != value:
+            self.cells[y * self.cols + x] = value
+            self.changed.add(cell)
+
+    def color(self, value):
+        player = value - PLAYER
+        if player == self.player:
+            return COLORS[0]
+        return COLORS[1 + player % (len(COLORS) - 1)]
+
+    def draw(self, surface):
+        for idx, value in enumerate(self.cells):
+            if value:
+                self.draw_cell(surface, (idx % self.cols, idx // self.cols))
+
+    def draw_cell(self, surface, cell):
+        """Same look as Snake.draw_cell, one color per player"""
+        x, y = cell
+        seg = pg.Rect(x * GS, y * GS, GS, GS)
+        value = self.cells[y * self.cols + x]
+        if value:
+            pg.draw.rect(surface, self.color(value), seg)
+            pg.draw.rect(surface, pg.Color("black"), seg, 3)
+        else:
+            surface.fill(BACKGROUND, seg)
+        return seg
+
+    def is_free(self, cell):
+        x, y = cell
+        inside = 0 <= x < self.cols and 0 <= y < self.rows
+        return inside and not self.cells[y * self.cols + x]
+
+
+async def play(address=ARENA_ADDRESS):
+    """Thin client, the server owns the game and sends what to draw"""
+    reader, writer = await connect(address)
+    board = Board()
+
+    async def receive():
+        while True:
+            board.apply(*await read_frame(reader))
+
+    receiver = asyncio.ensure_future(receive())
+
+    pg.init()
+    pg.display.set_caption(CAPTION)
+    screen = pg.display.set_mode(SIZE, 0, 32)
+    renderer = Renderer(screen)
+
+    try:
+        while not receiver.done():
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    return
+                if event.type == pg.WINDOWEXPOSED:
+                    renderer.invalidate()
+                if event.type == pg.KEYDOWN:
+                    if event.key == pg.K_ESCAPE:
+                        return
+                    for i, (key, optkey) in enumerate(zip(keys, opt_keys)):
+                        if event.key in (key, optkey):
+                            writer.write(frame(TURN, bytes((i,))))
+
+            if board.player is not None:
+                pg.display.update(renderer.draw(board, board.target, board.score))
+            await asyncio.sleep(1.0 / FPS)
+    finally:
+        receiver.cancel()
+        writer.close()
+
+
+def bot_turn(board, rng):
+    """Direction index of a free step closest to the food, None to go on"""
+    head = board.heads.get(board.player)
+    if head is None:
+        return None
+    fx, fy = board.food
+    options = []
+    for i, (dx, dy) in enumerate(directions):
+        cell = head[0] + dx, head[1] + dy
+        if board.is_free(cell):
+            options.append((abs(cell[0] - fx) + abs(cell[1] - fy), rng.random(), i))
+    return min(options)[2] if options else None
+
+
+async def bot(address, stats, until, rng):
+    reader, writer = await connect(address)
+    board = Board()
+    last = None
+    try:
+        while time.perf_counter() < until:
+            kind, body = await read_frame(reader)
+            board.apply(kind, body)
+            if kind == WELCOME:
+                continue
+
+            now = time.perf_counter()
+            if last is not None:
+                stats.append(now - last)
+            last = now
+
+            turn = bot_turn(board, rng)
+            if turn is not None:
+                writer.write(frame(TURN, bytes((turn,))))
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def load(address=ARENA_ADDRESS, bots=1000, seconds=30.0):
+    """Run bots against a server and report what they observed"""
+    stats = []
+    until = time.perf_counter() + seconds
+    rng = random.Random(0)
+    tasks = []
+    for _ in range(bots):
+        tasks.append(asyncio.ensure_future(bot(address, stats, until, rng)))
+        # -- connect gradually, a burst of thousands overflows the backlog
+        await asyncio.sleep(0.001)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    interval = 1.0 / TICK_RATE
+    jitter = sorted(abs(s - interval) for s in stats)
+    if not jitter:
+        print("no ticks received")
+        return
+    print(
+        "{} bots  {:.0f} ticks/s received  tick jitter mean {:.2f} ms "
+        "p99 {:.2f} ms".format(
+            bots,
+            len(stats) / seconds,
+            1000 * sum(jitter) / len(jitter),
+            1000 * jitter[int(len(jitter) * 0.99)],
+        )
+    )
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else "play"
+    address = sys.argv[2] if len(sys.argv) > 2 else ARENA_ADDRESS
+    if mode == "load":
+        bots = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+        seconds = float(sys.argv[4]) if len(sys.argv) > 4 else 30.0
+        asyncio.run(load(address, bots, seconds))
+    else:
+        asyncio.run(play(address))
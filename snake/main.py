@@ -0,0 +1,484 @@
+import sys
+import random
+import pygame as pg
+from functools import lru_cache
+from collections import deque
+
+# GLOBALS
+FPS = 60
+SIZE = 500, 500
+CAPTION = "Snake"
+BACKGROUND = 100, 100, 100
+
+GS = 25
+HEADER_ROWS = 2
+
+# -- simulation ticks per second, gained per point and the upper bound
+TICK_RATE = 5
+TICK_RAMP = 0.0
+MAX_TICK_RATE = 20
+# -- turns buffered between ticks, one is applied per tick
+TURN_QUEUE = 3
+# -- longest stretch of time caught up after a stall
+MAX_CATCHUP = 0.25
+
+# -- strategy used by the autopilot, toggled with P (see autopilot.py)
+AUTOPILOT = "path"
+keys = [pg.K_w, pg.K_s, pg.K_a, pg.K_d]
+opt_keys = [pg.K_UP, pg.K_DOWN, pg.K_LEFT, pg.K_RIGHT]
+directions = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+class Ticker:
+    """Fixed rate simulation ticks out of variable length frames"""
+
+    def __init__(self, rate=TICK_RATE, ramp=TICK_RAMP, max_rate=MAX_TICK_RATE):
+        self.rate = rate
+        self.ramp = ramp
+        self.max_rate = max_rate
+        self.accumulator = 0.0
+
+    def interval(self, score):
+        """Seconds per tick at score, speeding up along the ramp"""
+        return 1.0 / min(self.rate + score * self.ramp, self.max_rate)
+
+    def add(self, dt):
+        self.accumulator = min(self.accumulator + dt, MAX_CATCHUP)
+
+    def step(self, score):
+        """Consume one tick if it is due"""
+        interval = self.interval(score)
+        if self.accumulator < interval:
+            return False
+        self.accumulator -= interval
+        return True
+
+    def reset(self):
+        self.accumulator = 0.0
+
+
+class FreeCells:
+    """Cells food can spawn on, O(1) add, remove and random choice"""
+
+    def __init__(self, cells):
+        # -- swap-remove array of cells plus the position of every cell in it
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        i = self.index.pop(cell, None)
+        if i is None:
+            return
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def choice(self):
+        return random.choice(self.cells)
+
+
+class Snake:
+    """ Make definitions for snake properties and behaviour"""
+
+    # -- first playfield row, the rows above hold the score header
+    top = HEADER_ROWS
+
+    def __init__(self, pos, segments, color, grid=(SIZE[0] // GS, SIZE[1] // GS)):
+        """Initialize the snake object, grid is (cols, rows) in cells"""
+
+        self.pos = pos
+        self.segments = segments
+        self.color = color
+        self.size = 25
+
+        # -- segment count per grid cell, a bytearray indexed y * cols + x
+        self.cols, self.rows = grid
+        self.occupied, self.free = self.make_board()
+        # -- cells whose occupancy changed since the renderer last looked
+        self.changed = set()
+
+        self.snake = self.make_snake()
+        self.direction = (0, -1)
+        self.turns = deque()
+
+    def make_snake(self):
+        """Create the segments of the snake as grid cells, head first"""
+
+        segs = deque()
+        px, py = self.pos[0] // GS, self.pos[1] // GS
+        for i in range(self.segments):
+            cell = (px, py + i)
+            segs.append(cell)
+            self.occupy(cell, 1)
+        return segs
+
+    def make_board(self):
+        """Segment count per cell and the cells food can spawn on"""
+        free = FreeCells(
+            (x, y)
+            for x in range(self.cols)
+            for y in range(self.top, self.rows)
+            if self.spawnable((x, y))
+        )
+        return bytearray(self.cols * self.rows), free
+
+    @property
+    def head(self):
+        return self.snake[0]
+
+    def in_grid(self, cell):
+        """Check that a cell is on the playfield, below the header"""
+        x, y = cell
+        return 0 <= x < self.cols and self.top <= y < self.rows
+
+    def spawnable(self, cell):
+        """Food never spawns on the leftmost column"""
+        return self.in_grid(cell) and cell[0] >= 1
+
+    @property
+    def board_full(self):
+        return not self.free
+
+    def occupy(self, cell, count):
+        """Add count segments to a cell, keeping the free cells in sync"""
+        if not self.in_grid(cell):
+            return
+        idx = cell[1] * self.cols + cell[0]
+        self.occupied[idx] += count
+        self.changed.add(cell)
+
+        if self.spawnable(cell):
+            if self.occupied[idx]:
+                self.free.remove(cell)
+            else:
+                self.free.add(cell)
+
+    def draw(self, surface):
+        """Iterate over all snake segments and draw"""
+
+        for cell in self.snake:
+            self.draw_cell(surface, cell)
+
+    def draw_cell(self, surface, cell):
+        """Draw one cell, a segment if occupied, background otherwise"""
+
+        x, y = cell
+        seg = pg.Rect(x * GS, y * GS, self.size, self.size)
+        if self.occupied[y * self.cols + x]:
+            pg.draw.rect(surface, self.color, seg)
+            pg.draw.rect(surface, pg.Color("black"), seg, 3)
+        else:
+            surface.fill(BACKGROUND, seg)
+        return seg
+
+    def event(self, ev):
+        """Handle all events accepted by the snake"""
+
+        # Listen to user events and queue a turn for the next ticks
+        if ev.type == pg.KEYDOWN:
+            for key, optkey, d in zip(keys, opt_keys, directions):
+                if ev.key in [key, optkey]:
+                    self.turn(d)
+                    break
+
+    def turn(self, d):
+        """Queue a turn, False if it was dropped"""
+
+        # -- turns are checked against the last queued one
+        last = self.turns[-1] if self.turns else self.direction
+
+        # Check for invalid moves
+        # e.g. moving up while the snake is moving down
+        edge_case = lambda d: any(
+            [
+                d == last,
+                d == (0, 1) and last == (0, -1),
+                d == (0, -1) and last == (0, 1),
+                d == (1, 0) and last == (-1, 0),
+                d == (-1, 0) and last == (1, 0),
+            ]
+        )
+
+        if edge_case(d) or len(self.turns) >= TURN_QUEUE:
+            return False
+        self.turns.append(d)
+        return True
+
+    def update(self, dt):
+        """
+        Move the snake:
+            - Take the next queued turn
+            - Add a new segment in each direction
+            - The last segment is removed by collide_target
+        """
+        if self.turns:
+            self.direction = self.turns.popleft()
+
+        hx, hy = self.head
+        dx, dy = self.direction
+        head = hx + dx, hy + dy
+        self.snake.appendleft(head)
+        self.occupy(head, 1)
+
+    def collide_target(self, target):
+
+        hx, hy = self.head
+        if (hx * GS, hy * GS) == tuple(target.pos):
+            target.spawn(self)
+            return True
+        else:
+            self.occupy(self.snake.pop(), -1)
+            return False
+
+    def collide_walls(self):
+        return not self.in_grid(self.head)
+
+    def collide_self(self):
+        hx, hy = self.head
+        return self.in_grid(self.head) and self.occupied[hy * self.cols + hx] > 1
+
+
+class Target:
+    def __init__(self, pos, size, color):
+        self.pos = pos
+        self.size = size
+        self.color = color
+        self.rect = None
+
+    def draw(self, surface):
+        px, py = self.pos
+        sx, sy = self.size
+
+        pg.draw.rect(surface, self.color, [px, py, sx, sy])
+        pg.draw.rect(surface, pg.Color("black"), [px, py, sx, sy], 3)
+        self.rect = pg.Rect(px, py, sx, sy)
+
+    def spawn(self, snake):
+        """Move to a random free cell, False when the snake fills the board"""
+        if snake.board_full:
+            return False
+
+        # -- target can't spawn on current location or on the snake
+        current = self.pos[0] // GS, self.pos[1] // GS
+        x, y = snake.free.choice()
+        while (x, y) == current and len(snake.free) > 1:
+            x, y = snake.free.choice()
+
+        self.pos = (x * GS, y * GS)
+        return True
+
+
+@lru_cache(maxsize=None)
+def get_font(size, bold=False, italic=False):
+    font = pg.font.Font(pg.font.match_font("arial"), size)
+    font.set_bold(bold)
+    font.set_italic(italic)
+    return font
+
+
+def draw_score(surface, score):
+    options = [
+        ("Score", 12, (25, 12), "black"),
+        (str(score), 15, (17, 30), "white"),
+        (CAPTION, 40, (SIZE[0] // 2, 25), (80, 80, 80)),
+    ]
+
+    # -- header highlight
+    header = pg.draw.rect(surface, pg.Color("grey"), [0, 0, SIZE[0], 50])
+    pg.draw.rect(surface, (80, 80, 80), [10, 20, 50, 20])
+
+    # -- options
+    for txt, fs, pos, fcol in options:
+        font = get_font(fs, bold=txt != CAPTION)
+
+        surf = font.render(txt, True, pg.Color(fcol) if isinstance(fcol, str) else fcol)
+        rect = surf.get_rect()
+        rect.center = pos
+
+        surface.blit(surf, rect)
+    return header
+
+
+def draw_game_over(surface, score):
+    # -- Draw Game Over Text
+    font = get_font(40, bold=True)
+
+    tsurface = font.render("GAME OVER", True, pg.Color("red"))
+    text_rect = tsurface.get_rect()
+    text_rect.center = (SIZE[0] // 2, 100)
+    surface.blit(tsurface, text_rect)
+
+    # -- Draw score text
+    font = get_font(20, bold=True)
+
+    tsurface = font.render("Your Score " + str(score), True, pg.Color("white"))
+    text_rect = tsurface.get_rect()
+    text_rect.center = (SIZE[0] // 2, 200)
+    surface.blit(tsurface, text_rect)
+
+    # -- Draw instructions
+    font = get_font(12, bold=True, italic=True)
+
+    tsurface = font.render(
+        "Press Escape to QUIT, Space to RESTART", True, pg.Color("white")
+    )
+    text_rect = tsurface.get_rect()
+    text_rect.center = (SIZE[0] // 2, SIZE[1] - 20)
+    surface.blit(tsurface, text_rect)
+
+
+class Renderer:
+    """Keeps the screen between frames and repaints only what changed"""
+
+    def __init__(self, surface):
+        self.surface = surface
+        self.invalidate()
+
+    def invalidate(self):
+        """Repaint everything on the next frame"""
+        self.full = True
+        self.score = None
+        self.food = None
+
+    def draw(self, snake, target, score):
+        """Paint the changes since the last frame, returns the dirty rects"""
+        surface = self.surface
+        if self.full:
+            self.full = False
+            self.score, self.food = score, target.pos
+            snake.changed.clear()
+
+            surface.fill(BACKGROUND)
+            draw_score(surface, score)
+            snake.draw(surface)
+            target.draw(surface)
+            return [surface.get_rect()]
+
+        rects = []
+        if score != self.score:
+            self.score = score
+            rects.append(draw_score(surface, score))
+
+        # -- a new head and the vacated tail, more after catch-up ticks
+        for cell in snake.changed:
+            rects.append(snake.draw_cell(surface, cell))
+        snake.changed.clear()
+
+        if target.pos != self.food:
+            self.food = target.pos
+            target.draw(surface)
+            rects.append(target.rect)
+        return rects
+
+    def draw_game_over(self, score):
+        """The game over screen is static, paint it once"""
+        if not self.full:
+            return []
+        self.full = False
+        self.surface.fill(BACKGROUND)
+        draw_game_over(self.surface, score)
+        return [self.surface.get_rect()]
+
+
+def main():
+    # -- autopilot imports this module, it can only be loaded once we run
+    from autopilot import Autopilot
+
+    # Pygame Context
+    pg.init()
+    pg.display.set_caption(CAPTION)
+    screen = pg.display.set_mode(SIZE, 0, 32)
+    clock = pg.time.Clock()
+    renderer = Renderer(screen)
+
+    # Game Objects
+    snake = Snake((225, 225), 5, pg.Color("red"))
+    target = Target((100, 100), (GS, GS), pg.Color("green"))
+    pilot = None
+    ticker = Ticker()
+
+    # Game Variables
+    score = 0
+    gameover = False
+    paused = False
+
+    # Game Loop
+    while True:
+        dt = clock.tick(FPS) / 1000.0
+
+        # Events
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                sys.exit()
+            if event.type == pg.WINDOWEXPOSED:
+                renderer.invalidate()
+            if event.type == pg.KEYDOWN:
+                if event.key == pg.K_ESCAPE:
+                    sys.exit()
+
+                if event.key == pg.K_TAB:
+                    paused = not paused
+
+                if event.key == pg.K_p:
+                    pilot = None if pilot else Autopilot(snake, AUTOPILOT)
+
+                if gameover and event.key == pg.K_SPACE:
+                    # -- reset items
+                    score = 0
+                    snake = Snake((225, 225), 5, pg.Color("red"))
+                    target = Target((100, 100), (GS, GS), pg.Color("green"))
+                    if pilot:
+                        pilot = Autopilot(snake, AUTOPILOT)
+                    ticker.reset()
+                    renderer.invalidate()
+
+                    # -- resume
+                    gameover = False
+
+            if not paused:
+                snake.event(event)
+
+        if paused:
+            continue
+
+        # Update
+        if not gameover:
+            ticker.add(dt)
+        while not gameover and ticker.step(score):
+            if pilot:
+                pilot.steer(snake, target)
+            snake.update(dt)
+            if snake.collide_target(target):
+                score += 1
+
+            if snake.collide_walls() or snake.collide_self() or snake.board_full:
+                gameover = True
+                renderer.invalidate()
+
+        # Draw
+        if gameover:
+            pg.display.update(renderer.draw_game_over(score))
+        else:
+            pg.display.update(renderer.draw(snake, target, score))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # -- a cell count plays on a large scrolling world, see world.py
+        import world
+
+        world.main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,146 @@
+"""
+Headless vectorized Snake for training bots.
+
+SnakeVecEnv steps N independent games at once with the rules of main.py:
+one cell per tick, no turning back on yourself, death on walls and on the
+body, food on a random free cell away from the leftmost column.
+
+The body of every game lives in an (N, H, W) array holding, for every
+occupied cell, the number of ticks until the tail leaves it. Moving the
+snake is one subtraction, the head cell gets the snake length.
+"""
+import numpy as np
+
+from main import SIZE, GS, HEADER_ROWS, directions
+
+DIRECTIONS = np.array(directions, dtype=np.int64)
+# -- index of the opposite direction, turning back is ignored
+OPPOSITE = np.array([directions.index((-dx, -dy)) for dx, dy in directions])
+
+# -- observation cell values
+EMPTY, BODY, HEAD, FOOD = range(4)
+
+
+class SnakeVecEnv:
+    """N Snake games stepped together over NumPy arrays"""
+
+    def __init__(
+        self,
+        count,
+        size=(SIZE[0] // GS, SIZE[1] // GS - HEADER_ROWS),
+        segments=5,
+        max_steps=None,
+        seed=None,
+    ):
+        self.count = count
+        self.width, self.height = size
+        self.segments = segments
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+
+        self.body = np.zeros((count, self.height, self.width), dtype=np.int32)
+        self.head = np.zeros((count, 2), dtype=np.int64)
+        self.food = np.zeros((count, 2), dtype=np.int64)
+        self.direction = np.zeros(count, dtype=np.int64)
+        self.length = np.zeros(count, dtype=np.int32)
+        self.scores = np.zeros(count, dtype=np.int64)
+        self.steps = np.zeros(count, dtype=np.int64)
+
+        # -- food never spawns on the leftmost column, as in main.py
+        self.spawnable = np.ones((self.height, self.width), dtype=bool)
+        self.spawnable[:, 0] = False
+
+        self.reset()
+
+    def reset(self, mask=None):
+        """Restart the games selected by mask, all of them by default"""
+        if mask is None:
+            mask = np.ones(self.count, dtype=bool)
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return self.observe()
+
+        # -- heading up from where main.py starts it, body trailing below
+        hx, hy = (self.width - 1) // 2, (self.height - 1) // 2 - 1
+        self.body[idx] = 0
+        for i in range(self.segments):
+            if hy + i < self.height:
+                self.body[idx, hy + i, hx] = self.segments - i
+
+        self.head[idx] = hx, hy
+        self.direction[idx] = directions.index((0, -1))
+        self.length[idx] = self.segments
+        self.scores[idx] = 0
+        self.steps[idx] = 0
+        self.spawn(idx)
+        return self.observe()
+
+    def spawn(self, idx):
+        """Put food on a random free cell of the games in idx"""
+        free = (self.body[idx] == 0) & self.spawnable
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1.0
+
+        cells = keys.reshape(len(idx), -1).argmax(axis=1)
+        self.food[idx, 0] = cells % self.width
+        self.food[idx, 1] = cells // self.width
+        return free.reshape(len(idx), -1).any(axis=1)
+
+    def observe(self):
+        """(N, H, W) uint8 grids of EMPTY, BODY, HEAD and FOOD cells"""
+        obs = (self.body > 0).astype(np.uint8) * BODY
+        rows = np.arange(self.count)
+        obs[rows, self.food[:, 1], self.food[:, 0]] = FOOD
+        obs[rows, self.head[:, 1], self.head[:, 0]] = HEAD
+        return obs
+
+    def step(self, actions):
+        """
+        Advance every game by one tick.
+
+        actions index into main.directions. Returns (observations, rewards,
+        dones, scores), finished games are reset before observing and their
+        final scores are reported in scores.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        turn = actions != OPPOSITE[self.direction]
+        self.direction = np.where(turn, actions, self.direction)
+
+        head = self.head + DIRECTIONS[self.direction]
+        x, y = head[:, 0], head[:, 1]
+        wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        alive = np.flatnonzero(~wall)
+
+        rows, hx, hy = alive, x[alive], y[alive]
+        eat = np.zeros(self.count, dtype=bool)
+        eat[alive] = (hx == self.food[alive, 0]) & (hy == self.food[alive, 1])
+
+        # -- the tail moves on unless the snake grows this tick
+        moving = ~eat
+        np.subtract(self.body, 1, out=self.body, where=moving[:, None, None])
+        np.maximum(self.body, 0, out=self.body)
+
+        hit = np.zeros(self.count, dtype=bool)
+        hit[alive] = self.body[rows, hy, hx] > 0
+
+        self.length += eat
+        self.body[rows, hy, hx] = self.length[alive]
+        self.head[alive] = head[alive]
+        self.scores += eat
+        self.steps += 1
+
+        rewards = eat.astype(np.float32)
+        dones = wall | hit
+
+        # -- a snake filling the board has nowhere left to put food
+        eaten = np.flatnonzero(eat & ~dones)
+        if len(eaten):
+            dones[eaten[~self.spawn(eaten)]] = True
+
+        rewards[wall | hit] = -1.0
+        if self.max_steps is not None:
+            dones |= self.steps >= self.max_steps
+
+        scores = self.scores.copy()
+        self.reset(dones)
+        return self.observe(), rewards, dones, scores
@@ -0,0 +1,255 @@
+"""
+Large-grid Snake.
+
+The world is a uint8 array of EMPTY, BODY, HEAD and FOOD cells indexed
+[x, y], the snake and the food only write the cells they change. Camera
+copies the window around the head into an 8 bit palette surface with
+surfarray and scales it onto the screen, so a frame costs the same for a
+snake of five segments on a small board as for a long one on a
+1000 x 1000 world.
+
+Run main.py with a cell count, e.g. ``python main.py 1000``.
+"""
+import sys
+import random
+
+import numpy as np
+import pygame as pg
+
+from main import (
+    FPS,
+    GS,
+    SIZE,
+    CAPTION,
+    BACKGROUND,
+    HEADER_ROWS,
+    AUTOPILOT,
+    Ticker,
+    Snake,
+    Target,
+    draw_score,
+    draw_game_over,
+)
+
+# -- world cell values, indices into PALETTE
+EMPTY, BODY, HEAD, FOOD = range(4)
+PALETTE = [BACKGROUND, (200, 0, 0), (255, 90, 90), (0, 200, 0)]
+
+# -- on screen size of a world cell
+VIEW_CELL = 10
+# -- random draws before food falls back to scanning for free cells
+SPAWN_TRIES = 64
+
+
+class World:
+    """Cells of a cols x rows world"""
+
+    def __init__(self, size):
+        self.size = self.cols, self.rows = size
+        self.cells = np.zeros(size, dtype=np.uint8)
+
+
+class WorldFree:
+    """FreeCells interface over the occupancy of a WorldSnake"""
+
+    def __init__(self, snake):
+        self.snake = snake
+        self.count = (snake.cols - 1) * (snake.rows - snake.top)
+
+    def __len__(self):
+        return self.count
+
+    def choice(self):
+        snake = self.snake
+        occupied, cols = snake.occupied, snake.cols
+
+        # -- a mostly empty world, random cells are nearly always free
+        for _ in range(SPAWN_TRIES):
+            x = random.randrange(1, cols)
+            y = random.randrange(snake.top, snake.rows)
+            if not occupied[y * cols + x]:
+                return x, y
+
+        grid = np.frombuffer(occupied, dtype=np.uint8).reshape(snake.rows, cols)
+        free = np.flatnonzero(grid[snake.top :, 1:] == 0)
+        y, x = divmod(int(random.choice(free)), cols - 1)
+        return x + 1, y + snake.top
+
+
+class WorldSnake(Snake):
+    """Snake that mirrors its body into the cells of a World"""
+
+    top = 0
+
+    def __init__(self, world, pos, segments):
+        self.world = world
+        super().__init__(pos, segments, None, world.size)
+        self.mark(self.head, HEAD)
+
+    def make_board(self):
+        return bytearray(self.cols * self.rows), WorldFree(self)
+
+    def mark(self, cell, value):
+        if self.in_grid(cell):
+            self.world.cells[cell] = value
+
+    def occupy(self, cell, count):
+        if not self.in_grid(cell):
+            return
+        x, y = cell
+        idx = y * self.cols + x
+        was = self.occupied[idx]
+        self.occupied[idx] += count
+
+        now = self.occupied[idx]
+        if bool(was) != bool(now):
+            self.world.cells[cell] = BODY if now else EMPTY
+            if x >= 1:
+                self.free.count += -1 if now else 1
+
+    def update(self, dt):
+        self.mark(self.head, BODY)
+        super().update(dt)
+
+    def collide_target(self, target):
+        # -- the tail may leave the cell the head just moved into
+        eaten = super().collide_target(target)
+        self.mark(self.head, HEAD)
+        return eaten
+
+
+class WorldTarget(Target):
+    """Food that marks its cell in a World"""
+
+    def __init__(self, world):
+        super().__init__((0, 0), (GS, GS), None)
+        self.world = world
+
+    def spawn(self, snake):
+        cell = self.pos[0] // GS, self.pos[1] // GS
+        if self.world.cells[cell] == FOOD:
+            self.world.cells[cell] = EMPTY
+
+        spawned = super().spawn(snake)
+        if spawned:
+            self.world.cells[self.pos[0] // GS, self.pos[1] // GS] = FOOD
+        return spawned
+
+
+class Camera:
+    """Window of view cells on the world, kept around the snake's head"""
+
+    def __init__(self, world, view, cell_size=VIEW_CELL):
+        self.world = world
+        self.width = min(view[0], world.cols)
+        self.height = min(view[1], world.rows)
+        self.x = self.y = 0
+
+        # -- cells go in as palette indices, scaling keeps the palette
+        self.cells = pg.Surface((self.width, self.height), 0, 8)
+        self.cells.set_palette(PALETTE)
+        self.image = pg.Surface(
+            (self.width * cell_size, self.height * cell_size), 0, 8
+        )
+        self.image.set_palette(PALETTE)
+
+    def follow(self, cell):
+        """Centre the window on cell without leaving the world"""
+        x, y = cell
+        self.x = max(0, min(x - self.width // 2, self.world.cols - self.width))
+        self.y = max(0, min(y - self.height // 2, self.world.rows - self.height))
+
+    def draw(self, surface, pos):
+        window = self.world.cells[
+            self.x : self.x + self.width, self.y : self.y + self.height
+        ]
+        pg.surfarray.blit_array(self.cells, window)
+        pg.transform.scale(self.cells, self.image.get_size(), self.image)
+        surface.blit(self.image, pos)
+
+
+def new_game(cells):
+    world = World((cells, cells))
+    snake = WorldSnake(world, ((cells // 2) * GS, (cells // 2) * GS), 5)
+    target = WorldTarget(world)
+    target.spawn(snake)
+    return world, snake, target
+
+
+def main(cells):
+    # -- autopilot imports main, see main.main
+    from autopilot import Autopilot
+
+    pg.init()
+    pg.display.set_caption(CAPTION)
+    screen = pg.display.set_mode(SIZE, 0, 32)
+    clock = pg.time.Clock()
+
+    # -- the viewport fills the screen below the score header
+    header = HEADER_ROWS * GS
+    view = SIZE[0] // VIEW_CELL, (SIZE[1] - header) // VIEW_CELL
+
+    world, snake, target = new_game(cells)
+    camera = Camera(world, view)
+    pilot = None
+    ticker = Ticker()
+
+    score = 0
+    gameover = False
+    paused = False
+
+    while True:
+        dt = clock.tick(FPS) / 1000.0
+
+        # Events
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                sys.exit()
+            if event.type == pg.KEYDOWN:
+                if event.key == pg.K_ESCAPE:
+                    sys.exit()
+
+                if event.key == pg.K_TAB:
+                    paused = not paused
+
+                if event.key == pg.K_p:
+                    pilot = None if pilot else Autopilot(snake, AUTOPILOT)
+
+                if gameover and event.key == pg.K_SPACE:
+                    score = 0
+                    world, snake, target = new_game(cells)
+                    camera = Camera(world, view)
+                    if pilot:
+                        pilot = Autopilot(snake, AUTOPILOT)
+                    ticker.reset()
+                    gameover = False
+
+            if not paused:
+                snake.event(event)
+
+        if paused:
+            continue
+
+        # Update
+        if not gameover:
+            ticker.add(dt)
+        while not gameover and ticker.step(score):
+            if pilot:
+                pilot.steer(snake, target)
+            snake.update(dt)
+            if snake.collide_target(target):
+                score += 1
+
+            if snake.collide_walls() or snake.collide_self() or snake.board_full:
+                gameover = True
+
+        # Draw
+        screen.fill(BACKGROUND)
+        if gameover:
+            draw_game_over(screen, score)
+        else:
+            draw_score(screen, score)
+            camera.follow(snake.head)
+            camera.draw(screen, (0, header))
+
+        pg.display.flip()